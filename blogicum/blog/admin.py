@@ -1,12 +1,71 @@
 from django.contrib import admin
+from django.db import transaction
+from django.http import StreamingHttpResponse
 
+from core.changelist import EstimatedCountMixin, InputFilter
+from core.tasks import enqueue
+
+from .export import (EXPORT_FORMATS, get_export_filename, get_export_queryset,
+                     iter_export)
+from .images import delete_variants
 from .models import Category, Comment, Location, Post
+from .signals import change_comment_count
+from .tasks import generate_post_image_variants
 
 admin.site.empty_value_display = 'Не задано'
 
 
+def _stream_export(queryset, export_format):
+    response = StreamingHttpResponse(
+        iter_export(get_export_queryset(queryset), export_format),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    filename = get_export_filename(queryset.model, export_format)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@admin.action(description='Выгрузить выбранные в JSON Lines')
+def export_jsonl(modeladmin, request, queryset):
+    return _stream_export(queryset, 'jsonl')
+
+
+@admin.action(description='Выгрузить выбранные в CSV')
+def export_csv(modeladmin, request, queryset):
+    return _stream_export(queryset, 'csv')
+
+
+class ExportActionsMixin:
+    """Действия потоковой выгрузки выбранных строк."""
+
+    actions = (export_jsonl, export_csv)
+
+
+class AuthorFilter(InputFilter):
+    title = 'автору (логин)'
+    parameter_name = 'author'
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author__username=self.value().strip())
+        return queryset
+
+
+class PostFilter(InputFilter):
+    title = 'публикации (id)'
+    parameter_name = 'post'
+
+    def queryset(self, request, queryset):
+        value = (self.value() or '').strip()
+        if value.isdigit():
+            return queryset.filter(post_id=int(value))
+        if value:
+            return queryset.none()
+        return queryset
+
+
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'description',
@@ -28,9 +87,13 @@ class CategoryAdmin(admin.ModelAdmin):
         'description',
     )
 
+    search_fields = (
+        'title',
+    )
+
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display = (
         'name',
         'is_published',
@@ -45,9 +108,13 @@ class LocationAdmin(admin.ModelAdmin):
         'is_published',
     )
 
+    search_fields = (
+        'name',
+    )
+
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(EstimatedCountMixin, ExportActionsMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'pub_date',
@@ -62,10 +129,16 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
     )
 
-    list_filter = (
+    list_select_related = (
         'author',
         'location',
         'category',
+    )
+
+    list_filter = (
+        AuthorFilter,
+        'location',
+        'category',
         'is_published',
     )
 
@@ -75,9 +148,30 @@ class PostAdmin(admin.ModelAdmin):
         'category',
     )
 
+    search_fields = (
+        'title',
+    )
+
+    autocomplete_fields = (
+        'author',
+        'location',
+        'category',
+    )
+
+    def save_model(self, request, obj, form, change):
+        if 'image' not in form.changed_data:
+            return super().save_model(request, obj, form, change)
+        # Копии прежнего фото больше не подходят.
+        old_variants = obj.image_variants
+        obj.image_variants = {}
+        super().save_model(request, obj, form, change)
+        delete_variants(obj.image.storage, old_variants)
+        enqueue(generate_post_image_variants, post_id=obj.id)
+
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(EstimatedCountMixin, ExportActionsMixin,
+                   admin.ModelAdmin):
     list_display = (
         'text',
         'post',
@@ -85,9 +179,14 @@ class CommentAdmin(admin.ModelAdmin):
         'author',
     )
 
-    list_filter = (
+    list_select_related = (
         'post',
         'author',
+    )
+
+    list_filter = (
+        PostFilter,
+        AuthorFilter,
         'created_at',
     )
 
@@ -96,3 +195,17 @@ class CommentAdmin(admin.ModelAdmin):
         'post',
         'author',
     )
+
+    autocomplete_fields = (
+        'post',
+        'author',
+    )
+
+    def save_model(self, request, obj, form, change):
+        # Новые и удалённые комментарии считает blog.signals,
+        # а перенос в другой пост виден только здесь.
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if change and 'post' in form.changed_data:
+                change_comment_count(form.initial['post'], -1)
+                change_comment_count(obj.post_id, 1)
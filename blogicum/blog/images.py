@@ -0,0 +1,90 @@
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Ширины уменьшенных копий: карточка в ленте, страница поста и retina.
+VARIANT_WIDTHS = (640, 1280, 1920)
+VARIANTS_DIR = 'variants'
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+
+def get_variant_name(name: str, width: int, extension: str) -> str:
+    """Возвращает имя файла уменьшенной копии изображения name."""
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, VARIANTS_DIR, f'{stem}_{width}.{extension}'
+    )
+
+
+def _encode(image: Image.Image, image_format: str, **options) -> ContentFile:
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_variants(image_file) -> dict:
+    """
+    Сохраняет уменьшенные копии изображения в исходном формате и в WebP.
+
+    Изображение не увеличивается: копии шире оригинала заменяются
+    одной копией в его исходном размере.
+    Возвращает словарь {ширина: {'fallback': имя, 'webp': имя}}.
+    """
+    storage = image_file.storage
+    with image_file.open('rb') as file:
+        original = ImageOps.exif_transpose(Image.open(file))
+        original.load()
+
+    has_alpha = original.mode in ('RGBA', 'LA', 'P')
+    if has_alpha:
+        original = original.convert('RGBA')
+        fallback_format, fallback_extension, fallback_options = (
+            'PNG', 'png', {'optimize': True}
+        )
+    else:
+        original = original.convert('RGB')
+        fallback_format, fallback_extension, fallback_options = (
+            'JPEG', 'jpg', {'quality': JPEG_QUALITY, 'optimize': True,
+                            'progressive': True}
+        )
+
+    widths = sorted(
+        {min(width, original.width) for width in VARIANT_WIDTHS}
+    )
+    variants = {}
+    for width in widths:
+        height = max(round(original.height * width / original.width), 1)
+        resized = original.resize((width, height), Image.Resampling.LANCZOS)
+        names = {}
+        for key, image_format, extension, options in (
+            ('fallback', fallback_format, fallback_extension,
+             fallback_options),
+            ('webp', 'WEBP', 'webp', {'quality': WEBP_QUALITY}),
+        ):
+            name = get_variant_name(image_file.name, width, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            names[key] = storage.save(
+                name, _encode(resized, image_format, **options)
+            )
+        variants[str(width)] = names
+    return variants
+
+
+def delete_variants(storage, variants: dict) -> None:
+    """Удаляет файлы копий из словаря, который вернул generate_variants."""
+    for names in variants.values():
+        for name in names.values():
+            storage.delete(name)
+
+
+def update_post_image_variants(post) -> None:
+    """Пересоздаёт уменьшенные копии изображения поста и сохраняет пост."""
+    post.image_variants = (
+        generate_variants(post.image) if post.image else {}
+    )
+    post.save(update_fields=('image_variants', 'updated_at'))
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from blog.export import (EXPORT_CHUNK_SIZE, EXPORT_FORMATS, EXPORT_MODELS,
+                         get_export_queryset, iter_export)
+
+
+def parse_since(value: str):
+    """Разбирает дату или дату и время ISO 8601 в aware datetime."""
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(value)
+        since = datetime.combine(date, datetime.min.time())
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает посты, комментарии, категории и местоположения '
+        'в JSON Lines или CSV.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--models',
+            nargs='+',
+            choices=EXPORT_MODELS,
+            help='Какие модели выгрузить; по умолчанию все.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=EXPORT_FORMATS,
+            default='jsonl',
+            help='Формат выгрузки.',
+        )
+        parser.add_argument(
+            '--since',
+            help='Выгрузить только строки, созданные или изменённые '
+                 'после этого момента (ISO 8601).',
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для выгрузки; по умолчанию стандартный вывод.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Сколько строк читать из БД за один раз.',
+        )
+
+    def handle(self, *args, **options):
+        names = options['models'] or list(EXPORT_MODELS)
+        if options['format'] == 'csv' and len(names) > 1:
+            raise CommandError('В CSV можно выгрузить только одну модель.')
+        since = None
+        try:
+            if options['since']:
+                since = parse_since(options['since'])
+        except ValueError:
+            raise CommandError(
+                f'Не удалось разобрать дату --since: {options["since"]}.'
+            )
+
+        output = (
+            open(options['output'], 'w', encoding='utf-8', newline='')
+            if options['output'] else None
+        )
+        try:
+            for name in names:
+                queryset = get_export_queryset(EXPORT_MODELS[name], since)
+                for line in iter_export(
+                    queryset, options['format'], options['chunk_size']
+                ):
+                    if output:
+                        output.write(line)
+                    else:
+                        self.stdout.write(line, ending='')
+        finally:
+            if output:
+                output.close()
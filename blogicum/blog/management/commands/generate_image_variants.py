@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import update_post_image_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии и WebP для изображений постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии и для постов, у которых они уже есть.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='')
+        if not options['force']:
+            posts = posts.filter(image_variants={})
+        processed = 0
+        for post in posts.iterator():
+            try:
+                update_post_image_variants(post)
+            except (OSError, ValueError) as error:
+                self.stderr.write(f'Пост {post.id}: {error}')
+                continue
+            processed += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано изображений: {processed}')
+        )
@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.utils import get_next_publication_time, publish_scheduled_posts
+
+# Как часто по умолчанию проверять отложенные посты, в секундах.
+DEFAULT_INTERVAL = 30
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит в ленту отложенные посты, '
+        'у которых наступила дата публикации.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, а не завершаться после одной проверки.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=DEFAULT_INTERVAL,
+            help='Максимальная пауза между проверками в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            post_ids = publish_scheduled_posts()
+            if post_ids:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Выведено в ленту постов: {len(post_ids)}'
+                    )
+                )
+            if not options['loop']:
+                break
+            time.sleep(self.get_pause(options['interval']))
+
+    @staticmethod
+    def get_pause(interval: float) -> float:
+        """Возвращает паузу до ближайшей публикации, не длиннее interval."""
+        next_pub_date = get_next_publication_time()
+        if next_pub_date is None:
+            return interval
+        until_next = (next_pub_date - timezone.now()).total_seconds()
+        return min(interval, max(until_next, 0))
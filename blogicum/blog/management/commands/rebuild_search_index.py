@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Заново строит поисковый индекс по всем постам.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Поисковый индекс ({backend.name}) перестроен.'
+        ))
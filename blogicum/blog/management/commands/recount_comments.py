@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.utils import recount_comments
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев у постов.'
+
+    def handle(self, *args, **options):
+        fixed = recount_comments()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}')
+        )
@@ -0,0 +1,102 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:34
+
+import re
+from collections import Counter
+
+from django.db import OperationalError, migrations, models
+import django.db.models.deletion
+
+FTS_TABLE = 'blog_post_fts'
+TERM_MAX_LENGTH = 64
+WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """
+    Копия blog.search.tokenize на момент миграции: миграция не должна
+    меняться вместе с кодом приложения.
+    """
+    return [
+        word[:TERM_MAX_LENGTH]
+        for word in WORD_RE.findall(text.casefold().replace('ё', 'е'))
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Создаёт таблицу FTS5, если она поддерживается, и заполняет индекс.
+
+    Без FTS5 заполняется индекс на Python в модели SearchTerm.
+    """
+    Post = apps.get_model('blog', 'Post')
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, text)'
+            )
+        except OperationalError:
+            pass
+        else:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                    'VALUES (%s, %s, %s)',
+                    [
+                        (
+                            post.id,
+                            ' '.join(tokenize(post.title)),
+                            ' '.join(tokenize(post.text)),
+                        )
+                        for post in Post.objects.only('title', 'text')
+                    ],
+                )
+            return
+
+    SearchTerm = apps.get_model('blog', 'SearchTerm')
+    for post in Post.objects.only('title', 'text').iterator():
+        title_counts = Counter(tokenize(post.title))
+        text_counts = Counter(tokenize(post.text))
+        SearchTerm.objects.bulk_create(
+            SearchTerm(
+                term=term,
+                post_id=post.id,
+                title_count=title_counts[term],
+                text_count=text_counts[term],
+            )
+            for term in title_counts.keys() | text_counts.keys()
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Слово')),
+                ('title_count', models.PositiveIntegerField(default=0, verbose_name='В заголовке')),
+                ('text_count', models.PositiveIntegerField(default=0, verbose_name='В тексте')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'слово поискового индекса',
+                'verbose_name_plural': 'Поисковый индекс',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchterm',
+            constraint=models.UniqueConstraint(fields=('term', 'post'), name='search_term_post_unique'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:40
+
+import re
+
+from django.db import migrations
+
+FTS_TABLE = 'blog_post_fts'
+TERM_MAX_LENGTH = 64
+WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """
+    Копия blog.search.tokenize на момент миграции: миграция не должна
+    меняться вместе с кодом приложения.
+    """
+    return [
+        word[:TERM_MAX_LENGTH]
+        for word in WORD_RE.findall(text.casefold().replace('ё', 'е'))
+    ]
+
+
+def recreate_fts_table(apps, schema_editor, tokenizer):
+    """Пересоздаёт таблицу FTS5 с токенизатором tokenizer и заполняет её."""
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or (
+        FTS_TABLE not in connection.introspection.table_names()
+    ):
+        return
+    Post = apps.get_model('blog', 'Post')
+    schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {FTS_TABLE} '
+        f"USING fts5(title, text, tokenize = '{tokenizer}')"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            [
+                (
+                    post.id,
+                    ' '.join(tokenize(post.title)),
+                    ' '.join(tokenize(post.text)),
+                )
+                for post in Post.objects.only('title', 'text')
+            ],
+        )
+
+
+def keep_diacritics(apps, schema_editor):
+    # Как и в индексе на Python, «й» не совпадает с «и», а «é» с «e».
+    recreate_fts_table(
+        apps, schema_editor, 'unicode61 remove_diacritics 0'
+    )
+
+
+def remove_diacritics(apps, schema_editor):
+    recreate_fts_table(apps, schema_editor, 'unicode61')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_diacritics, remove_diacritics),
+    ]
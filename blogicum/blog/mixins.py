@@ -1,8 +1,37 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import Http404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.cache import get_page_cache_version
+from core.replicas import reading_from_replicas, replica_may_lag
+
+from .paginators import CursorPaginator, FeedPaginator, InvalidCursor
+
+
+class ObjectCacheMixin:
+    """
+    Миксин запоминает объект, найденный get_object, до конца запроса,
+    чтобы проверка прав, обработка формы и контекст шаблона
+    не загружали его из БД повторно.
+    """
 
+    _cached_object = None
 
-class AuthorTestMixin(UserPassesTestMixin):
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if self._cached_object is None:
+            self._cached_object = super().get_object()
+        return self._cached_object
+
+
+class AuthorTestMixin(ObjectCacheMixin, UserPassesTestMixin):
     """
     Миксин добавляет функцию test_func,
     которая проверяет является ли пользователь автором поста.
@@ -10,7 +39,55 @@ class AuthorTestMixin(UserPassesTestMixin):
 
     def test_func(self):
         object = self.get_object()
-        return object.author == self.request.user
+        return object.author_id == self.request.user.id
+
+
+class ConditionalGetMixin:
+    """
+    Миксин отвечает 304 Not Modified на условные GET- и HEAD-запросы
+    по ETag и Last-Modified из get_validators() и версии кэша страниц.
+    """
+
+    def get_validators(self) -> Optional[dict]:
+        """Время последних изменений страницы; None — без валидаторов."""
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        version = get_page_cache_version()
+        if reading_from_replicas() and replica_may_lag(version):
+            return super().dispatch(request, *args, **kwargs)
+        validators = self.get_validators()
+        if not validators:
+            return super().dispatch(request, *args, **kwargs)
+
+        etag = quote_etag(hashlib.md5(repr((
+            sorted(validators.items()),
+            version,
+            request.user.pk,
+            request.get_full_path(),
+        )).encode()).hexdigest())
+        last_modified = None
+        if not request.user.is_authenticated:
+            last_modified = int(max(
+                [version / 10 ** 9] + [
+                    value.timestamp() for value in validators.values()
+                    if isinstance(value, datetime)
+                ]
+            ))
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
 
 
 class ReverseMixin:
@@ -24,3 +101,51 @@ class ReverseMixin:
             'blog:post_detail',
             kwargs={'post_id': self.kwargs['post_id']},
         )
+
+
+class FeedPaginationMixin:
+    """
+    Миксин для ListView с лентой постов.
+
+    Если в запросе передан параметр cursor, включает курсорную пагинацию.
+    Иначе работает постраничная пагинация с закэшированным количеством
+    постов, а в контекст передаётся сокращённый список номеров
+    страниц page_range.
+    """
+
+    cursor_kwarg = 'cursor'
+    paginator_class = FeedPaginator
+    pages_on_each_side = 2
+    pages_on_ends = 1
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return super().get_paginator(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            count_cache_key=self.request.path,
+            **kwargs,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.cursor_kwarg not in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET[self.cursor_kwarg])
+        except InvalidCursor:
+            raise Http404('Неверный курсор пагинации.')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None and not getattr(page, 'cursor_paginated', False):
+            context['page_range'] = page.paginator.get_elided_page_range(
+                page.number,
+                on_each_side=self.pages_on_each_side,
+                on_ends=self.pages_on_ends,
+            )
+        return context
@@ -12,7 +12,7 @@ User = get_user_model()
 class CreatedPublishedModel(models.Model):
     """
     Абстрактный класс, который добавляет к
-    моделям поля is_published и creates_at.
+    моделям поля is_published, created_at и updated_at.
     """
 
     is_published = models.BooleanField(
@@ -26,6 +26,11 @@ class CreatedPublishedModel(models.Model):
         blank=False,
         verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Изменено'
+    )
 
     class Meta:
         abstract = True
@@ -88,6 +93,12 @@ class Post(CreatedPublishedModel):
         help_text=('Если установить дату и время в будущем —'
                    ' можно делать отложенные публикации.')
     )
+    is_live = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='В ленте',
+        help_text='Отмечается, когда наступает дата и время публикации.'
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -112,11 +123,38 @@ class Post(CreatedPublishedModel):
         blank=True,
         upload_to='blog_images'
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии фото'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_published_feed_idx',
+                condition=models.Q(is_published=True, is_live=True),
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True, is_live=True),
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title[:NUMBER_OF_CHARS]
@@ -136,6 +174,11 @@ class Comment(models.Model):
         auto_now_add=True,
         verbose_name='Создан'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Изменён'
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -144,8 +187,45 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return f'{self.author}: {self.text[:NUMBER_OF_CHARS]}'
+
+
+class SearchTerm(models.Model):
+    """
+    Слово поискового индекса на Python и число его вхождений в пост.
+
+    Используется, когда SQLite собран без FTS5 (blog.search).
+    """
+
+    term = models.CharField('Слово', max_length=64)
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Пост',
+    )
+    title_count = models.PositiveIntegerField('В заголовке', default=0)
+    text_count = models.PositiveIntegerField('В тексте', default=0)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('term', 'post'),
+                name='search_term_post_unique',
+            ),
+        )
+        verbose_name = 'слово поискового индекса'
+        verbose_name_plural = 'Поисковый индекс'
+
+    def __str__(self):
+        return self.term
@@ -0,0 +1,197 @@
+import base64
+import binascii
+import json
+import time
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Optional
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+from core.replicas import reading_from_replicas, replica_may_lag
+
+FORWARD = 'next'
+BACKWARD = 'prev'
+
+# Сколько секунд хранится закэшированное количество постов в ленте.
+COUNT_CACHE_TIMEOUT = 60
+COUNT_VERSION_KEY = 'feed-count-version'
+
+
+class InvalidCursor(Exception):
+    """Курсор пагинации повреждён или подделан."""
+
+
+def encode_cursor(direction: str, position: Optional[tuple] = None) -> str:
+    """
+    Кодирует направление и позицию (дата, id) в непрозрачный токен.
+
+    Курсор первой страницы — пустая строка.
+    """
+    if direction == FORWARD and position is None:
+        return ''
+    pub_date, pk = position or (None, None)
+    payload = [direction, pub_date and pub_date.isoformat(), pk]
+    return base64.urlsafe_b64encode(
+        json.dumps(payload).encode()
+    ).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Разбирает токен курсора в пару (направление, позиция)."""
+    if not cursor:
+        return FORWARD, None
+    try:
+        direction, pub_date, pk = json.loads(
+            base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        )
+        if direction not in (FORWARD, BACKWARD):
+            raise ValueError
+        if pub_date is None and pk is None:
+            return direction, None
+        return direction, (datetime.fromisoformat(pub_date), int(pk))
+    except (binascii.Error, TypeError, ValueError) as error:
+        raise InvalidCursor(cursor) from error
+
+
+def get_count_version() -> int:
+    """Возвращает текущую версию закэшированных счётчиков лент."""
+    return cache.get_or_set(COUNT_VERSION_KEY, time.time_ns, None)
+
+
+def invalidate_feed_counts() -> None:
+    """Делает устаревшими все закэшированные счётчики лент."""
+    cache.set(COUNT_VERSION_KEY, time.time_ns(), None)
+
+
+class FeedPaginator(Paginator):
+    """
+    Постраничный пагинатор, который берёт количество постов из кэша.
+
+    Счётчик сбрасывается при изменении постов и категорий и при выводе
+    отложенных постов в ленту, а COUNT_CACHE_TIMEOUT ограничивает
+    время жизни счётчика на случай изменений в обход сигналов.
+    Из реплики, которая может отставать от последнего изменения,
+    количество считается без кэша.
+    """
+
+    def __init__(self, *args, count_cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return super().count
+        version = get_count_version()
+        if reading_from_replicas() and replica_may_lag(version):
+            return super().count
+        key = f'feed-count:{version}:{self.count_cache_key}'
+        return cache.get_or_set(
+            key, lambda: Paginator.count.func(self), COUNT_CACHE_TIMEOUT
+        )
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации с переходами только вперёд и назад."""
+
+    cursor_paginated = True
+
+    def __init__(self, object_list, paginator, next_position=None,
+                 previous_position=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_position = next_position
+        self.previous_position = previous_position
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} objects>'
+
+    def has_next(self):
+        return self.next_position is not None
+
+    def has_previous(self):
+        return self.previous_position is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(FORWARD, self.next_position)
+
+    @property
+    def previous_cursor(self):
+        return encode_cursor(BACKWARD, self.previous_position)
+
+    @property
+    def first_cursor(self):
+        return encode_cursor(FORWARD)
+
+    @property
+    def last_cursor(self):
+        return encode_cursor(BACKWARD)
+
+
+class CursorPaginator:
+    """
+    Пагинатор по ключу (pub_date, id) от новых постов к старым.
+
+    В отличие от django.core.paginator.Paginator не считает общее
+    количество объектов и не использует OFFSET: каждая страница
+    выбирается по условию на ключ последнего показанного поста.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def page(self, cursor: str) -> CursorPage:
+        direction, position = decode_cursor(cursor)
+        queryset = self.queryset
+        if direction == FORWARD:
+            if position is not None:
+                pub_date, pk = position
+                queryset = queryset.filter(
+                    Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+                )
+            queryset = queryset.order_by('-pub_date', '-id')
+        else:
+            if position is not None:
+                pub_date, pk = position
+                queryset = queryset.filter(
+                    Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+                )
+            queryset = queryset.order_by('pub_date', 'id')
+
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if direction == BACKWARD:
+            object_list.reverse()
+        if not object_list:
+            return CursorPage(object_list, self)
+
+        first, last = object_list[0], object_list[-1]
+        if direction == FORWARD:
+            has_next, has_previous = has_more, position is not None
+        else:
+            has_next, has_previous = position is not None, has_more
+        return CursorPage(
+            object_list,
+            self,
+            next_position=(last.pub_date, last.id) if has_next else None,
+            previous_position=(
+                (first.pub_date, first.id) if has_previous else None
+            ),
+        )
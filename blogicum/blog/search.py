@@ -0,0 +1,190 @@
+"""
+Полнотекстовый поиск по заголовку и тексту постов.
+
+Если SQLite собран с FTS5, индекс хранится в виртуальной таблице
+blog_post_fts. Иначе используется инвертированный индекс на Python
+в модели SearchTerm. Индекс обновляется сигналами при сохранении
+и удалении поста; видимость постов проверяется при поиске.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+from .models import Post, SearchTerm
+
+# Сколько лучших совпадений возвращает индекс.
+MAX_SEARCH_RESULTS = 500
+# Совпадение в заголовке весит больше, чем в тексте.
+TITLE_WEIGHT = 10.0
+TERM_MAX_LENGTH = 64
+
+FTS_TABLE = 'blog_post_fts'
+WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> list:
+    """Разбивает текст на слова в нижнем регистре."""
+    return [
+        word[:TERM_MAX_LENGTH]
+        for word in WORD_RE.findall(text.casefold().replace('ё', 'е'))
+    ]
+
+
+class FTS5Backend:
+    """
+    Индекс в виртуальной таблице SQLite FTS5.
+
+    В таблицу записываются слова после tokenize(), а токенизатор
+    таблицы не убирает диакритику, чтобы запросы нормализовались
+    так же, как в индексе на Python.
+    """
+
+    name = 'fts5'
+
+    @staticmethod
+    def get_row(post) -> list:
+        return [
+            post.id,
+            ' '.join(tokenize(post.title)),
+            ' '.join(tokenize(post.text)),
+        ]
+
+    def index_post(self, post) -> None:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.id]
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                self.get_row(post),
+            )
+
+    def remove_post(self, post_id: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id]
+            )
+
+    def rebuild(self) -> None:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                [
+                    self.get_row(post)
+                    for post in Post.objects.only('title', 'text').iterator()
+                ],
+            )
+
+    def search(self, words: list) -> list:
+        # Каждое слово — отдельная фраза с поиском по префиксу,
+        # поэтому синтаксис FTS5 из запроса пользователя не выполняется.
+        match = ' '.join(f'"{word}"*' for word in words)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY bm25({FTS_TABLE}, %s, 1.0) LIMIT %s',
+                [match, TITLE_WEIGHT, MAX_SEARCH_RESULTS],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PythonBackend:
+    """Инвертированный индекс: слово → посты с числом вхождений."""
+
+    name = 'python'
+
+    @staticmethod
+    def get_terms(post) -> list:
+        title_counts = Counter(tokenize(post.title))
+        text_counts = Counter(tokenize(post.text))
+        return [
+            SearchTerm(
+                term=term,
+                post_id=post.id,
+                title_count=title_counts[term],
+                text_count=text_counts[term],
+            )
+            for term in title_counts.keys() | text_counts.keys()
+        ]
+
+    def index_post(self, post) -> None:
+        with transaction.atomic():
+            SearchTerm.objects.filter(post_id=post.id).delete()
+            SearchTerm.objects.bulk_create(self.get_terms(post))
+
+    def remove_post(self, post_id: int) -> None:
+        SearchTerm.objects.filter(post_id=post_id).delete()
+
+    def rebuild(self) -> None:
+        with transaction.atomic():
+            SearchTerm.objects.all().delete()
+            for post in Post.objects.only('title', 'text').iterator():
+                SearchTerm.objects.bulk_create(self.get_terms(post))
+
+    def search(self, words: list) -> list:
+        """
+        Ранжирует посты по TF-IDF. Пост должен содержать все слова
+        запроса, слово совпадает с началом слова в индексе.
+        """
+        total = SearchTerm.objects.values('post_id').distinct().count()
+        scores = None
+        for word in set(words):
+            weights = defaultdict(float)
+            for post_id, title_count, text_count in (
+                SearchTerm.objects.filter(
+                    term__gte=word, term__lt=word + '\uffff'
+                ).values_list('post_id', 'title_count', 'text_count')
+            ):
+                weights[post_id] += TITLE_WEIGHT * title_count + text_count
+            idf = math.log(1 + total / len(weights)) if weights else 0
+            word_scores = {
+                post_id: idf * (1 + math.log(weight))
+                for post_id, weight in weights.items()
+            }
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {
+                    post_id: score + word_scores[post_id]
+                    for post_id, score in scores.items()
+                    if post_id in word_scores
+                }
+        ranked = sorted(scores or {}, key=lambda key: (-scores[key], -key))
+        return ranked[:MAX_SEARCH_RESULTS]
+
+
+_fts5_tables = {}
+
+
+def fts5_table_exists() -> bool:
+    """Проверяет, создана ли миграцией таблица FTS5 в текущей БД."""
+    key = (connection.alias, str(connection.settings_dict['NAME']))
+    if key not in _fts5_tables:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = %s",
+                    [FTS_TABLE],
+                )
+                _fts5_tables[key] = cursor.fetchone() is not None
+        except DatabaseError:
+            _fts5_tables[key] = False
+    return _fts5_tables[key]
+
+
+def get_search_backend():
+    """Возвращает поисковый индекс по настройке SEARCH_BACKEND."""
+    name = settings.SEARCH_BACKEND
+    if name == 'auto':
+        name = (
+            'fts5'
+            if connection.vendor == 'sqlite' and fts5_table_exists()
+            else 'python'
+        )
+    return FTS5Backend() if name == 'fts5' else PythonBackend()
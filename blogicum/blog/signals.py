@@ -0,0 +1,88 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from core.cache import invalidate_page_cache
+
+from .images import delete_variants
+from .models import Category, Comment, Location, Post
+from .paginators import invalidate_feed_counts
+from .search import get_search_backend
+
+# Поля поста, которые попадают в поисковый индекс.
+SEARCH_FIELDS = frozenset(('title', 'text'))
+
+# Отправляется, когда у отложенных постов наступило время публикации.
+# Аргументы: post_ids — список id постов, попавших в ленту.
+post_went_live = Signal()
+
+
+@receiver(pre_save, sender=Post)
+def set_is_live(instance, **kwargs):
+    """
+    Отмечает, попал ли пост в ленту. Обработчик срабатывает и при
+    raw-сохранении из loaddata, которое не вызывает Post.save().
+    """
+    instance.is_live = instance.pub_date <= timezone.now()
+
+
+def change_comment_count(post_id: int, delta: int) -> None:
+    """Изменяет счётчик комментариев поста на delta на стороне БД."""
+    Post.objects.filter(id=post_id).update(
+        comment_count=F('comment_count') + delta
+    )
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(instance, created, raw, **kwargs):
+    """Увеличивает счётчик комментариев поста."""
+    # В фикстуре счётчик уже посчитан.
+    if created and not raw:
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(instance, **kwargs):
+    """
+    Уменьшает счётчик комментариев поста при любом удалении,
+    в том числе каскадном вместе с автором.
+    """
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver((post_save, post_delete), sender=Post)
+@receiver((post_save, post_delete), sender=Category)
+@receiver(post_went_live)
+def reset_feed_counts(**kwargs):
+    """Сбрасывает закэшированное количество постов в лентах."""
+    invalidate_feed_counts()
+
+
+@receiver((post_save, post_delete), sender=Post)
+@receiver((post_save, post_delete), sender=Comment)
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Location)
+@receiver(post_went_live)
+def reset_page_cache(**kwargs):
+    """Сбрасывает кэш страниц для анонимных пользователей."""
+    invalidate_page_cache()
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(instance, update_fields=None, **kwargs):
+    """Переиндексирует пост, если изменились его заголовок или текст."""
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        get_search_backend().index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(instance, **kwargs):
+    """Удаляет пост из поискового индекса."""
+    get_search_backend().remove_post(instance.id)
+
+
+@receiver(post_delete, sender=Post)
+def remove_image_variants(instance, **kwargs):
+    """Удаляет файлы уменьшенных копий фото удалённого поста."""
+    delete_variants(instance.image.storage, instance.image_variants)
@@ -0,0 +1,12 @@
+from core.tasks import task
+
+from .images import update_post_image_variants
+from .models import Post
+
+
+@task
+def generate_post_image_variants(post_id: int) -> None:
+    """Создаёт уменьшенные копии изображения поста."""
+    post = Post.objects.filter(id=post_id).first()
+    if post is not None:
+        update_post_image_variants(post)
@@ -0,0 +1,40 @@
+from django import template
+from django.utils.html import format_html
+
+register = template.Library()
+
+# Ширина карточки поста в шаблонах — 40rem.
+DEFAULT_SIZES = '(max-width: 40rem) 100vw, 40rem'
+
+
+def _srcset(storage, variants: dict, key: str) -> str:
+    return ', '.join(
+        f'{storage.url(names[key])} {width}w'
+        for width, names in sorted(
+            variants.items(), key=lambda item: int(item[0])
+        )
+    )
+
+
+@register.simple_tag
+def responsive_image(image, variants=None, css_class='', sizes=DEFAULT_SIZES):
+    """
+    Выводит изображение поста тегом <picture> с вариантами в WebP
+    и в исходном формате, чтобы браузер выбрал подходящий размер.
+    Если уменьшенных копий ещё нет, выводит исходный файл.
+    """
+    if not variants:
+        return format_html('<img class="{}" src="{}">', css_class, image.url)
+    storage = image.storage
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img class="{}" src="{}" srcset="{}" sizes="{}">'
+        '</picture>',
+        _srcset(storage, variants, 'webp'),
+        sizes,
+        css_class,
+        image.url,
+        _srcset(storage, variants, 'fallback'),
+        sizes,
+    )
@@ -8,6 +8,7 @@ app_name: str = 'blog'
 urlpatterns: list[path] = [
     path('', views.IndexListView.as_view(), name='index'),
     path('create/', views.PostCreateView.as_view(), name='create_post'),
+    path('search/', views.PostSearchView.as_view(), name='search'),
     path('profile/edit/', UserUpdateView.as_view(), name='edit_profile'),
     path('profile/<str:username>/', UserListView.as_view(), name='profile'),
     path(
@@ -30,6 +31,11 @@ urlpatterns: list[path] = [
         views.CategoryListView.as_view(),
         name='category_posts'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.CommentListView.as_view(),
+        name='comments'
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.CommentCreateView.as_view(),
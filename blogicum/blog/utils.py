@@ -1,27 +1,214 @@
+from datetime import datetime
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Substr
 from django.db.models.query import QuerySet
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
-from .models import Post
+from .models import Comment, Post
+from .paginators import FORWARD, encode_cursor
+from .search import get_search_backend, tokenize
+from .signals import post_went_live
+
+# Сколько символов текста поста достаточно для truncatewords:10 в карточке.
+PREVIEW_TEXT_LENGTH = 512
 
 
-def get_selection_of_posts(field: str) -> QuerySet:
+def get_published_filter() -> Q:
     """
-    Возвращает посты с дополнительными данными
-    из связанного поля, которое передано в аргумент field.
+    Возвращает условие, по которому пост виден читателям:
+    - пост опубликован,
+    - дата публикации наступила (is_live),
+    - категория поста опубликована.
     """
-    return Post.objects.select_related(field)
+    return Q(
+        is_published=True,
+        is_live=True,
+        category__is_published=True,
+    )
 
 
-def add_default_filters() -> dict:
+def is_visible(post: Post) -> bool:
     """
-    Возвращает словарь с полями для фильтрации:
-    - is_published,
-    - category__is_published,
-    - pub_date__lte.
+    Проверяет видимость уже загруженного поста
+    по тем же правилам, что и get_published_filter().
     """
-    filter_dict = dict(
-        is_published=True,
-        pub_date__lte=timezone.now(),
-        category__is_published=True,
+    return (
+        post.is_published
+        and post.is_live
+        and post.category is not None
+        and post.category.is_published
     )
-    return filter_dict
+
+
+def get_post_for_user_or_404(post_id: int, user) -> Post:
+    """
+    Возвращает пост с автором, категорией и местоположением.
+    Чужой пост, скрытый от читателей, даёт ошибку 404.
+    """
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'category', 'location'),
+        id=post_id,
+    )
+    if post.author_id != user.id and not is_visible(post):
+        raise Http404('Публикация не найдена.')
+    return post
+
+
+def get_comments_batch(
+        post: Post, size: int, before: Optional[tuple] = None
+) -> tuple:
+    """
+    Возвращает самые новые комментарии поста (не больше size штук),
+    написанные раньше позиции before = (created_at, id),
+    в порядке от старых к новым.
+
+    Вторым элементом возвращается курсор самого старого из выбранных
+    комментариев, если есть ещё более ранние, иначе None.
+    """
+    queryset = Comment.objects.select_related('author').filter(
+        post=post
+    ).order_by('-created_at', '-id')
+    if before is not None:
+        created_at, pk = before
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    comments = list(queryset[:size + 1])
+    has_older = len(comments) > size
+    comments = comments[:size]
+    comments.reverse()
+    if not has_older:
+        return comments, None
+    return comments, encode_cursor(
+        FORWARD, (comments[0].created_at, comments[0].id)
+    )
+
+
+def get_posts_feed(published_only: bool = True) -> QuerySet:
+    """
+    Возвращает ленту постов для вывода карточками.
+
+    Автор, категория и местоположение подгружаются одним запросом,
+    а вместо полного текста выбирается только его начало (preview_text).
+    Если published_only=True, в ленту попадают только
+    видимые читателям посты.
+    """
+    queryset = Post.objects.select_related(
+        'author', 'category', 'location'
+    ).defer(
+        'text'
+    ).annotate(
+        preview_text=Substr('text', 1, PREVIEW_TEXT_LENGTH),
+    ).order_by('-pub_date', '-id')
+    if published_only:
+        queryset = queryset.filter(get_published_filter())
+    return queryset
+
+
+def get_feed_validators(**filters) -> dict:
+    """
+    Возвращает валидаторы ленты видимых постов для условного GET:
+    время последнего изменения поста, его категории и местоположения.
+    """
+    return Post.objects.filter(get_published_filter(), **filters).aggregate(
+        posts_updated_at=Max('updated_at'),
+        categories_updated_at=Max('category__updated_at'),
+        locations_updated_at=Max('location__updated_at'),
+    )
+
+
+def get_post_validators(post_id: int) -> dict:
+    """
+    Возвращает валидаторы страницы поста для условного GET:
+    время изменения поста, его категории, местоположения
+    и комментариев и число комментариев.
+    """
+    return Post.objects.filter(id=post_id).aggregate(
+        post_updated_at=Max('updated_at'),
+        category_updated_at=Max('category__updated_at'),
+        location_updated_at=Max('location__updated_at'),
+        comments_updated_at=Max('comments__updated_at'),
+        comments=Max('comment_count'),
+    )
+
+
+def recount_comments(queryset: Optional[QuerySet] = None) -> int:
+    """
+    Пересчитывает счётчики комментариев по таблице комментариев.
+
+    Возвращает количество постов, у которых счётчик был неверным.
+    """
+    if queryset is None:
+        queryset = Post.objects.all()
+    actual_count = Coalesce(
+        Subquery(
+            Comment.objects.filter(
+                post=OuterRef('pk')
+            ).order_by().values('post').annotate(
+                total=Count('id')
+            ).values('total')
+        ),
+        0,
+    )
+    return queryset.annotate(
+        actual_count=actual_count
+    ).exclude(
+        comment_count=F('actual_count')
+    ).update(comment_count=actual_count)
+
+
+def publish_scheduled_posts() -> list:
+    """
+    Выводит в ленту отложенные посты, у которых наступила дата публикации.
+
+    Отправляет сигнал post_went_live и возвращает id выведенных постов.
+    """
+    with transaction.atomic():
+        post_ids = list(
+            Post.objects.select_for_update().filter(
+                is_live=False,
+                pub_date__lte=timezone.now(),
+            ).values_list('id', flat=True)
+        )
+        if post_ids:
+            Post.objects.filter(id__in=post_ids).update(
+                is_live=True, updated_at=timezone.now()
+            )
+    if post_ids:
+        post_went_live.send(sender=Post, post_ids=post_ids)
+    return post_ids
+
+
+def get_next_publication_time() -> Optional[datetime]:
+    """Возвращает ближайшую дату публикации среди отложенных постов."""
+    return Post.objects.filter(is_live=False).aggregate(
+        next_pub_date=Min('pub_date')
+    )['next_pub_date']
+
+
+def search_posts(query: str) -> list:
+    """
+    Возвращает id видимых читателям постов, подходящих под запрос,
+    в порядке убывания релевантности.
+    """
+    words = tokenize(query)
+    if not words:
+        return []
+    ids = get_search_backend().search(words)
+    visible = set(
+        Post.objects.filter(
+            get_published_filter(), id__in=ids
+        ).values_list('id', flat=True)
+    )
+    return [post_id for post_id in ids if post_id in visible]
+
+
+def get_posts_by_ids(ids: list) -> list:
+    """Загружает посты для карточек в порядке списка ids."""
+    posts = get_posts_feed(published_only=False).in_bulk(ids)
+    return [posts[post_id] for post_id in ids if post_id in posts]
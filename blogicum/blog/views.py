@@ -1,72 +1,119 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
                                   UpdateView)
 
+from core.cache import AnonymousPageCacheMixin
+from core.replicas import ReplicaReadMixin
+from core.tasks import enqueue
+
 from .forms import CommentForm, PostForm
-from .mixins import AuthorTestMixin, ReverseMixin
+from .images import delete_variants
+from .mixins import (AuthorTestMixin, ConditionalGetMixin, FeedPaginationMixin,
+                     ReverseMixin)
 from .models import Category, Comment, Post
-from .utils import add_default_filters, get_selection_of_posts
+from .paginators import InvalidCursor, decode_cursor
+from .tasks import generate_post_image_variants
+from .utils import (get_comments_batch, get_feed_validators,
+                    get_post_for_user_or_404, get_post_validators,
+                    get_posts_by_ids, get_posts_feed, search_posts)
 
 NUMBER_OF_POSTS = 10
+NUMBER_OF_COMMENTS = 10
 
 
-class IndexListView(ListView):
+# Валидаторы — после кэша страниц и из той же БД, что и страница.
+class IndexListView(AnonymousPageCacheMixin, ReplicaReadMixin,
+                    ConditionalGetMixin, FeedPaginationMixin, ListView):
     """Представление для главной страницы сайта."""
 
     model = Post
     paginate_by = NUMBER_OF_POSTS
     template_name = 'blog/index.html'
 
+    def get_validators(self):
+        return get_feed_validators()
+
     def get_queryset(self):
-        return Post.objects.filter(
-            **add_default_filters()
-        ).annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
+        return get_posts_feed()
 
 
-class PostDetailView(DetailView):
+# Валидаторы — после кэша страниц и из той же БД, что и страница.
+class PostDetailView(AnonymousPageCacheMixin, ReplicaReadMixin,
+                     ConditionalGetMixin, DetailView):
     """Представление для отдельного поста."""
 
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
-    def get_object(self):
-        obj = get_selection_of_posts('author').filter(
-            id=self.kwargs['post_id']
+    def get_validators(self):
+        return get_post_validators(self.kwargs['post_id'])
+
+    def get_object(self, queryset=None):
+        return get_post_for_user_or_404(
+            self.kwargs['post_id'], self.request.user
         )
-        if obj and not obj[0].author == self.request.user:
-            filters = add_default_filters()
-        else:
-            filters = dict()
-        return get_object_or_404(obj, **filters)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'], context['comments_cursor'] = get_comments_batch(
+            self.object, NUMBER_OF_COMMENTS
+        )
         return context
 
 
-class CategoryListView(ListView):
+class CommentListView(AnonymousPageCacheMixin, ReplicaReadMixin, ListView):
+    """
+    Представление отдаёт HTML-фрагмент с более ранними комментариями
+    для кнопки «Показать более ранние комментарии».
+    """
+
+    post_obj = None
+    cursor = None
+    template_name = 'includes/comment_list.html'
+    context_object_name = 'comments'
+
+    def get_queryset(self):
+        self.post_obj = get_post_for_user_or_404(
+            self.kwargs['post_id'], self.request.user
+        )
+        try:
+            _, before = decode_cursor(self.request.GET['before'])
+        except (KeyError, InvalidCursor):
+            raise Http404('Неверный курсор комментариев.')
+        comments, self.cursor = get_comments_batch(
+            self.post_obj, NUMBER_OF_COMMENTS, before
+        )
+        return comments
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post'] = self.post_obj
+        context['comments_cursor'] = self.cursor
+        return context
+
+
+# Валидаторы — после кэша страниц и из той же БД, что и страница.
+class CategoryListView(AnonymousPageCacheMixin, ReplicaReadMixin,
+                       ConditionalGetMixin, FeedPaginationMixin, ListView):
     """Представление для категорий постов."""
 
     paginate_by = NUMBER_OF_POSTS
     template_name = 'blog/category.html'
 
+    def get_validators(self):
+        return get_feed_validators(
+            category__slug=self.kwargs['category_slug']
+        )
+
     def get_queryset(self):
-        queryset = get_selection_of_posts('category').filter(
+        return get_posts_feed().filter(
             category__slug=self.kwargs['category_slug'],
-        ).filter(
-            **add_default_filters()
-        ).annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
-        return queryset
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -78,6 +125,42 @@ class CategoryListView(ListView):
         return context
 
 
+class PostSearchView(AnonymousPageCacheMixin, ListView):
+    """
+    Представление поиска по заголовку и тексту постов.
+
+    Постранично разбивается список id найденных постов, а карточки
+    загружаются только для текущей страницы.
+    """
+
+    query_kwarg = 'q'
+    paginate_by = NUMBER_OF_POSTS
+    template_name = 'blog/search.html'
+    pages_on_each_side = FeedPaginationMixin.pages_on_each_side
+    pages_on_ends = FeedPaginationMixin.pages_on_ends
+
+    def get_queryset(self):
+        return search_posts(self.request.GET.get(self.query_kwarg, ''))
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, _, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        page.object_list = get_posts_by_ids(page.object_list)
+        return paginator, page, page.object_list, is_paginated
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        context['query'] = self.request.GET.get(self.query_kwarg, '').strip()
+        context['page_range'] = page.paginator.get_elided_page_range(
+            page.number,
+            on_each_side=self.pages_on_each_side,
+            on_ends=self.pages_on_ends,
+        )
+        return context
+
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     """Представление добавления нового поста."""
 
@@ -93,7 +176,10 @@ class PostCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        if 'image' in form.changed_data:
+            enqueue(generate_post_image_variants, post_id=self.object.id)
+        return response
 
 
 class PostUpdateView(AuthorTestMixin, ReverseMixin, UpdateView):
@@ -104,12 +190,16 @@ class PostUpdateView(AuthorTestMixin, ReverseMixin, UpdateView):
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        instance = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        form = PostForm(self.request.POST or None, instance=instance)
-        context['form'] = form
-        return context
+    def form_valid(self, form):
+        if 'image' not in form.changed_data:
+            return super().form_valid(form)
+        # Копии прежнего фото больше не подходят.
+        old_variants = form.instance.image_variants
+        form.instance.image_variants = {}
+        response = super().form_valid(form)
+        delete_variants(self.object.image.storage, old_variants)
+        enqueue(generate_post_image_variants, post_id=self.object.id)
+        return response
 
     def handle_no_permission(self):
         return redirect(self.get_success_url())
@@ -122,11 +212,12 @@ class PostDeleteView(AuthorTestMixin, DeleteView):
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('location')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        instance = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        form = PostForm(self.request.POST or None, instance=instance)
-        context['form'] = form
+        context['form'] = PostForm(instance=self.object)
         return context
 
     def get_success_url(self):
@@ -159,12 +250,7 @@ class CommentUpdateView(AuthorTestMixin, ReverseMixin, UpdateView):
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
-
-    def get_object(self, queryset=None):
-        return get_object_or_404(
-            Comment,
-            id=self.kwargs['comment_id'],
-        )
+    pk_url_kwarg = 'comment_id'
 
 
 class CommentDeleteView(AuthorTestMixin, ReverseMixin, DeleteView):
@@ -0,0 +1,7 @@
+"""
+Профили настроек проекта.
+
+Модуль не импортирует сами настройки, поэтому его можно загружать
+из кода, который работает при любом профиле.
+"""
+PROFILES = ('dev', 'test', 'prod')
@@ -0,0 +1,31 @@
+"""
+Настройки проекта blogicum.
+
+Профиль выбирается переменной окружения BLOGICUM_PROFILE:
+dev (по умолчанию), test или prod. Профиль можно указать и напрямую:
+DJANGO_SETTINGS_MODULE=blogicum.settings.prod.
+"""
+import os
+from importlib import import_module
+
+from django.core.exceptions import ImproperlyConfigured
+
+from blogicum.profiles import PROFILES
+
+# Пакет импортируется и перед модулем профиля, указанным напрямую;
+# тогда загружается этот профиль, а не профиль из BLOGICUM_PROFILE.
+PROFILE = os.environ.get('DJANGO_SETTINGS_MODULE', '').partition(
+    f'{__name__}.'
+)[2] or os.environ.get('BLOGICUM_PROFILE', 'dev')
+
+if PROFILE not in PROFILES:
+    raise ImproperlyConfigured(
+        f'Неизвестный профиль настроек BLOGICUM_PROFILE={PROFILE!r}, '
+        f'допустимые значения: {", ".join(PROFILES)}.'
+    )
+
+globals().update(
+    (name, value)
+    for name, value in vars(import_module(f'{__name__}.{PROFILE}')).items()
+    if name.isupper()
+)
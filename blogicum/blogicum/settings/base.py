@@ -1,6 +1,9 @@
 """
 Django settings for blogicum project.
 
+Общие настройки всех профилей; профили dev, test и prod
+переопределяют их в соседних модулях.
+
 Generated by 'django-admin startproject' using Django 3.2.16.
 
 For more information on this file, see
@@ -10,10 +13,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
 # Quick-start development settings - unsuitable for production
@@ -23,7 +27,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-ffn0pco2onh^t(0#+%*n^e$e_5gpn7*=71uvi!f8)0hr2u%lbh'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = False
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -42,12 +46,12 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
-    'debug_toolbar',
     'core.apps.CoreConfig',
     'django_bootstrap5',
 ]
 
 MIDDLEWARE = [
+    'core.metrics.ViewMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,11 +59,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
-]
-
-INTERNAL_IPS = [
-    '127.0.0.1',
+    'core.replicas.PrimaryPinMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -95,6 +95,65 @@ DATABASES = {
     }
 }
 
+# Реплики только для чтения (core.replicas): пути к копиям БД SQLite
+# через запятую в переменной окружения DJANGO_SQLITE_REPLICAS.
+REPLICA_DATABASES = []
+
+for number, replica_path in enumerate(
+    filter(None, os.environ.get('DJANGO_SQLITE_REPLICAS', '').split(',')),
+    start=1,
+):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / replica_path.strip(),
+    }
+    REPLICA_DATABASES.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+
+# Сколько секунд после записи пользователь читает только из default
+REPLICA_PIN_SECONDS = 10
+
+# Прагмы WAL, synchronous и др. для новых соединений с SQLite (core.db)
+SQLITE_TUNING = False
+
+# Значения, заменяющие core.db.DEFAULT_SQLITE_PRAGMAS
+SQLITE_PRAGMAS = {}
+
+# Сколько SQL-запросов может выполнить представление, прежде чем
+# запрос попадёт в лог (core.metrics); QUERY_BUDGETS — по именам
+QUERY_BUDGET = 30
+
+QUERY_BUDGETS = {}
+
+# Как часто процесс публикует свои метрики в кэш, секунд
+METRICS_PUBLISH_SECONDS = 30
+
+# Поисковый индекс (blog.search): 'auto', 'fts5' или 'python'
+SEARCH_BACKEND = 'auto'
+
+# Список изменений в админке (core.changelist): с какого числа строк
+# общее количество берётся приблизительно и до скольких считаются
+# отфильтрованные строки
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+
+ADMIN_COUNT_LIMIT = 10000
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Кэш страниц для анонимных пользователей (core.cache)
+PAGE_CACHE_ALIAS = 'default'
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -138,6 +197,18 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static_dev',
 ]
 
+STATIC_ROOT = BASE_DIR / 'static'
+
+# Имена файлов с хэшем и сжатые копии .gz/.br после collectstatic
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+# Раздача статики и медиафайлов WSGI-обёрткой (core.serving)
+SERVE_FILES = True
+
+STATIC_MAX_AGE = 60 * 60 * 24 * 365
+
+MEDIA_MAX_AGE = 60 * 60
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -154,3 +225,5 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 LOGIN_REDIRECT_URL = 'blog:index'
 
 MEDIA_ROOT = BASE_DIR / 'media'
+
+MEDIA_URL = '/media/'
@@ -0,0 +1,104 @@
+"""
+Профиль для боевого сервера.
+
+Секретный ключ и список хостов берутся из переменных окружения
+DJANGO_SECRET_KEY и DJANGO_ALLOWED_HOSTS (через запятую). Отладочные приложения
+и middleware из профиля dev сюда не попадают.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401, F403
+from .base import BASE_DIR, DATABASES, REPLICA_DATABASES, TEMPLATES
+
+PROFILE = 'prod'
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured(
+        'Для профиля prod задайте переменную окружения DJANGO_SECRET_KEY.'
+    )
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get(
+        'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+    ).split(',')
+    if host.strip()
+]
+
+# Соединение с БД переиспользуется между запросами.
+DATABASES = {
+    alias: {
+        **database,
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 60 * 10)),
+    }
+    for alias, database in DATABASES.items()
+}
+
+SQLITE_TUNING = True
+
+# Только нужные на боевом сервере middleware. MessageMiddleware
+# требуется админке, а cookie чтения из default ставится,
+# только если настроены реплики.
+MIDDLEWARE = [
+    'core.metrics.ViewMetricsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+if REPLICA_DATABASES:
+    MIDDLEWARE.append('core.replicas.PrimaryPinMiddleware')
+
+# Кэш общий для всех процессов сервера: иначе сброс кэша страниц
+# сигналами не дойдёт до соседних процессов. Если задан адрес
+# memcached в DJANGO_MEMCACHED_LOCATION, кэш хранится в нём.
+if os.environ.get('DJANGO_MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['DJANGO_MEMCACHED_LOCATION'],
+            'TIMEOUT': 60 * 10,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get(
+                'DJANGO_CACHE_DIR', str(BASE_DIR / 'cache')
+            ),
+            'TIMEOUT': 60 * 10,
+        }
+    }
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Шаблоны компилируются один раз на процесс.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'context_processors': [
+                processor
+                for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+                if processor != 'django.template.context_processors.debug'
+            ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
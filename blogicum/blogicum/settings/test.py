@@ -0,0 +1,20 @@
+"""Профиль для автотестов: без отладочных инструментов, с быстрым хэшем."""
+from .base import *  # noqa: F401, F403
+from .base import BASE_DIR, DATABASES
+
+PROFILE = 'test'
+
+# Стойкий хэш паролей в тестах только замедляет создание пользователей.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Отдельная БД для проверки чтения из реплик; в роутер она попадает,
+# только если тест добавит её в REPLICA_DATABASES.
+DATABASES = {
+    **DATABASES,
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'replica.sqlite3',
+    },
+}
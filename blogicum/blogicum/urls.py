@@ -14,13 +14,13 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from core.views import UserCreateView
+from core.views import UserCreateView, view_metrics
 
 urlpatterns = [
+    path('admin/metrics/', view_metrics, name='view_metrics'),
     path('admin/', admin.site.urls),
     path('', include('blog.urls')),
     path('category/', include('blog.urls')),
@@ -30,7 +30,7 @@ urlpatterns = [
     path('auth/registration/', UserCreateView.as_view(), name='registration'),
 ]
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
 
     # Добавить к списку urlpatterns список адресов из приложения debug_toolbar:
@@ -38,5 +38,3 @@ if settings.DEBUG:
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
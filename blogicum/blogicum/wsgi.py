@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+# Импорт после настройки Django: модулю нужны настройки проекта.
+from core.serving import get_file_serving_application  # noqa: E402
+
+application = get_file_serving_application(application)
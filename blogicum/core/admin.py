@@ -0,0 +1,28 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'created_at',
+        'finished_at',
+    )
+
+    list_filter = (
+        'status',
+        'name',
+    )
+
+    readonly_fields = (
+        'locked_at',
+        'locked_by',
+        'last_error',
+        'created_at',
+        'finished_at',
+    )
@@ -0,0 +1,382 @@
+"""Общие инструменты команд-замеров производительности."""
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from random import Random
+from types import SimpleNamespace
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth import urls as auth_urls
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test import Client
+from django.test.utils import (override_settings, setup_test_environment,
+                               teardown_test_environment)
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from faker import Faker
+from mixer.backend.django import Mixer
+
+from blog import urls as blog_urls
+from blog.models import Category, Comment, Location, Post
+from blog.paginators import FORWARD, encode_cursor, invalidate_feed_counts
+from blog.search import get_search_backend, tokenize
+from blog.utils import recount_comments
+from core.cache import invalidate_page_cache
+from pages import urls as pages_urls
+
+BENCHMARK_PASSWORD = 'benchmark'
+
+User = get_user_model()
+
+
+@contextmanager
+def temporary_database():
+    """
+    Создаёт на время блока временную файловую БД с миграциями.
+
+    Нужен командам-замерам: они не должны трогать рабочую БД, реплики
+    и общий кэш. Чтение идёт только из временной БД, кэш — свой
+    в памяти процесса.
+    """
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    test_name = test_settings.get('NAME')
+    isolated = override_settings(
+        REPLICA_DATABASES=[],
+        CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'benchmark',
+        }},
+        PAGE_CACHE_ALIAS='default',
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        test_settings['NAME'] = os.path.join(directory, 'temporary.sqlite3')
+        try:
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+        finally:
+            test_settings['NAME'] = test_name
+        setup_test_environment()
+        try:
+            with isolated:
+                yield
+        finally:
+            teardown_test_environment()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+class BenchmarkError(Exception):
+    """Страница ответила ошибкой во время замера."""
+
+
+class BenchmarkCase(NamedTuple):
+    """Один замеряемый запрос."""
+
+    url_name: str
+    path: str
+    method: str = 'GET'
+    client: str = 'аноним'
+    data: Optional[dict] = None
+    # Выход из аккаунта требует входа перед каждым запросом.
+    login_each: bool = False
+    # Строка запроса в названии, если настоящая меняется от запуска
+    # к запуску: по названию сравниваются результаты.
+    query_label: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        query = self.query_label or self.path.partition('?')[2]
+        return ' '.join(filter(None, (
+            self.client, self.method, self.url_name, query and f'?{query}'
+        )))
+
+
+def seed_database(users: int = 20, categories: int = 5, locations: int = 5,
+                  posts: int = 500, comments: int = 2000,
+                  seed: int = 0) -> SimpleNamespace:
+    """
+    Заполняет БД синтетическими данными mixer и Faker.
+
+    Объекты создаются без сохранения и записываются bulk_create,
+    поэтому сигналы не срабатывают: счётчики комментариев и поисковый
+    индекс пересчитываются в конце. Возвращает объекты, по которым
+    строятся адреса замера: автора, его пост, комментарий и категорию,
+    а также второго пользователя-читателя.
+    """
+    random = Random(seed)
+    faker = Faker('ru_RU')
+    faker.seed_instance(seed)
+    mixer = Mixer(commit=False)
+    now = timezone.now()
+
+    password = make_password(BENCHMARK_PASSWORD)
+    # bulk_create в SQLite не возвращает id, поэтому объекты
+    # перечитываются из БД.
+    User.objects.bulk_create(
+        mixer.blend(
+            User, username=f'user{number}', password=password,
+            is_active=True, is_staff=False, is_superuser=False,
+        )
+        for number in range(max(users, 2))
+    )
+    user_objects = list(User.objects.order_by('id'))
+    Category.objects.bulk_create(
+        mixer.blend(
+            Category, title=faker.sentence(nb_words=2)[:256],
+            description=faker.paragraph(), slug=f'category-{number}',
+            is_published=True,
+        )
+        for number in range(max(categories, 1))
+    )
+    category_objects = list(Category.objects.order_by('id'))
+    Location.objects.bulk_create(
+        mixer.blend(Location, name=faker.city(), is_published=True)
+        for _ in range(locations)
+    )
+    location_objects = list(Location.objects.order_by('id'))
+    Post.objects.bulk_create(
+        (
+            mixer.blend(
+                Post,
+                title=faker.sentence(nb_words=5)[:256],
+                text=faker.text(max_nb_chars=2000),
+                # Первый пост автора — самый свежий в ленте.
+                pub_date=now - timedelta(minutes=number + 1),
+                is_published=True,
+                is_live=True,
+                image='',
+                author=user_objects[number % len(user_objects)],
+                category=category_objects[number % len(category_objects)],
+                location=(
+                    random.choice(location_objects)
+                    if location_objects else None
+                ),
+            )
+            for number in range(max(posts, 1))
+        ),
+        batch_size=500,
+    )
+    post_objects = list(Post.objects.only('id'))
+    Comment.objects.bulk_create(
+        (
+            mixer.blend(
+                Comment,
+                text=faker.sentence(),
+                post=random.choice(post_objects),
+                author=random.choice(user_objects),
+            )
+            for _ in range(comments)
+        ),
+        batch_size=500,
+    )
+
+    author = user_objects[0]
+    post = Post.objects.filter(author=author).order_by('-pub_date').first()
+    comment = Comment.objects.create(
+        text=faker.sentence(), post=post, author=author
+    )
+    recount_comments()
+    get_search_backend().rebuild()
+    invalidate_feed_counts()
+    invalidate_page_cache()
+    return SimpleNamespace(
+        author=author,
+        reader=user_objects[1],
+        post=post,
+        comment=comment,
+        category=category_objects[0],
+        search_word=tokenize(post.title)[0],
+    )
+
+
+def get_url_names() -> set:
+    """Имена адресов блога, статических страниц и аутентификации."""
+    names = {'registration'}
+    names.update(
+        pattern.name for pattern in auth_urls.urlpatterns
+    )
+    for namespace, module in (('blog', blog_urls), ('pages', pages_urls)):
+        names.update(
+            f'{namespace}:{pattern.name}' for pattern in module.urlpatterns
+        )
+    return names
+
+
+def get_benchmark_cases(objects: SimpleNamespace) -> list:
+    """Возвращает запросы, которые покрывают все адреса get_url_names()."""
+    post_id = objects.post.id
+    comment_kwargs = {'post_id': post_id, 'comment_id': objects.comment.id}
+    # Вход автора меняет last_login и делает его токены сброса пароля
+    # недействительными, поэтому ссылка сброса строится для читателя.
+    uid = urlsafe_base64_encode(force_bytes(objects.reader.pk))
+    token = default_token_generator.make_token(objects.reader)
+    author_kwargs = {'client': 'автор'}
+    return [
+        BenchmarkCase('blog:index', reverse('blog:index')),
+        BenchmarkCase('blog:index', reverse('blog:index') + '?page=last'),
+        BenchmarkCase(
+            'blog:index',
+            reverse('blog:index') + f'?cursor={encode_cursor(FORWARD)}',
+        ),
+        BenchmarkCase('blog:index', reverse('blog:index'), **author_kwargs),
+        BenchmarkCase('blog:category_posts', reverse(
+            'blog:category_posts',
+            kwargs={'category_slug': objects.category.slug},
+        )),
+        BenchmarkCase('blog:post_detail', reverse(
+            'blog:post_detail', kwargs={'post_id': post_id}
+        )),
+        BenchmarkCase('blog:post_detail', reverse(
+            'blog:post_detail', kwargs={'post_id': post_id}
+        ), **author_kwargs),
+        BenchmarkCase('blog:comments', reverse(
+            'blog:comments', kwargs={'post_id': post_id}
+        ) + '?before=' + encode_cursor(
+            FORWARD, (objects.comment.created_at, objects.comment.id)
+        ), query_label='before=<курсор>'),
+        BenchmarkCase('blog:profile', reverse(
+            'blog:profile', kwargs={'username': objects.author.username}
+        )),
+        BenchmarkCase(
+            'blog:search',
+            reverse('blog:search') + f'?q={objects.search_word}',
+        ),
+        BenchmarkCase('blog:create_post', reverse('blog:create_post'),
+                      **author_kwargs),
+        BenchmarkCase('blog:edit_profile', reverse('blog:edit_profile'),
+                      **author_kwargs),
+        BenchmarkCase('blog:edit_post', reverse(
+            'blog:edit_post', kwargs={'post_id': post_id}
+        ), **author_kwargs),
+        BenchmarkCase('blog:delete_post', reverse(
+            'blog:delete_post', kwargs={'post_id': post_id}
+        ), **author_kwargs),
+        BenchmarkCase('blog:add_comment', reverse(
+            'blog:add_comment', kwargs={'post_id': post_id}
+        ), method='POST', data={'text': 'Комментарий'}, **author_kwargs),
+        BenchmarkCase('blog:edit_comment', reverse(
+            'blog:edit_comment', kwargs=comment_kwargs
+        ), **author_kwargs),
+        BenchmarkCase('blog:edit_comment', reverse(
+            'blog:edit_comment', kwargs=comment_kwargs
+        ), method='POST', data={'text': 'Изменённый комментарий'},
+            **author_kwargs),
+        BenchmarkCase('blog:delete_comment', reverse(
+            'blog:delete_comment', kwargs=comment_kwargs
+        ), **author_kwargs),
+        BenchmarkCase('pages:about', reverse('pages:about')),
+        BenchmarkCase('pages:rules', reverse('pages:rules')),
+        BenchmarkCase('registration', reverse('registration')),
+        BenchmarkCase('login', reverse('login')),
+        BenchmarkCase('login', reverse('login'), method='POST', data={
+            'username': objects.author.username,
+            'password': BENCHMARK_PASSWORD,
+        }),
+        BenchmarkCase('logout', reverse('logout'), login_each=True,
+                      **author_kwargs),
+        BenchmarkCase('password_change', reverse('password_change'),
+                      **author_kwargs),
+        BenchmarkCase('password_change_done',
+                      reverse('password_change_done'), **author_kwargs),
+        BenchmarkCase('password_reset', reverse('password_reset')),
+        BenchmarkCase('password_reset_done', reverse('password_reset_done')),
+        BenchmarkCase('password_reset_confirm', reverse(
+            'password_reset_confirm', kwargs={'uidb64': uid, 'token': token}
+        )),
+        BenchmarkCase('password_reset_complete',
+                      reverse('password_reset_complete')),
+    ]
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def run_case(case: BenchmarkCase, author, requests: int = 30,
+             warmup: int = 3) -> dict:
+    """
+    Выполняет запрос case warmup + requests раз через тестовый клиент.
+
+    Возвращает перцентили времени ответа в миллисекундах, среднее
+    число SQL-запросов и пропускную способность одного клиента.
+    """
+    client = Client()
+    if case.client == 'автор':
+        client.force_login(author)
+    request = getattr(client, case.method.lower())
+    timings = []
+    counter = _QueryCounter()
+    for number in range(warmup + requests):
+        if case.login_each:
+            client.force_login(author)
+        counter.queries = 0
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            response = request(case.path, data=case.data)
+            elapsed = time.perf_counter() - start
+        if response.status_code >= 400:
+            raise BenchmarkError(
+                f'{case.label} ответил кодом {response.status_code}.'
+            )
+        if number >= warmup:
+            timings.append((elapsed * 1000, counter.queries))
+    durations = [duration for duration, _ in timings]
+    cuts = statistics.quantiles(durations, n=100, method='inclusive')
+    return {
+        'requests': requests,
+        'p50': cuts[49],
+        'p95': cuts[94],
+        'p99': cuts[98],
+        'mean': statistics.fmean(durations),
+        'queries': statistics.fmean(queries for _, queries in timings),
+        'throughput': requests / (sum(durations) / 1000),
+    }
+
+
+def get_git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(previous: dict, current: dict,
+                    threshold: float) -> list:
+    """
+    Сравнивает два результата замера по общим запросам.
+
+    Возвращает строки (запрос, p50 до, p50 после, изменение в процентах,
+    SQL-запросов до, SQL-запросов после, признак регрессии). Регрессия —
+    рост p50 больше чем на threshold процентов или рост числа запросов.
+    """
+    rows = []
+    for label, result in current['results'].items():
+        old = previous['results'].get(label)
+        if old is None:
+            continue
+        change = (result['p50'] - old['p50']) / old['p50'] * 100
+        rows.append((
+            label, old['p50'], result['p50'], change,
+            old['queries'], result['queries'],
+            change > threshold or result['queries'] > old['queries'],
+        ))
+    return rows
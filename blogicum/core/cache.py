@@ -0,0 +1,90 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .replicas import replica_may_lag
+
+PAGE_CACHE_VERSION_KEY = 'page-cache-version'
+
+
+def get_page_cache():
+    """Возвращает бэкенд кэша, в котором хранятся страницы."""
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def get_page_cache_version() -> int:
+    """
+    Возвращает версию кэша страниц; она меняется при каждом
+    изменении контента блога.
+    """
+    return get_page_cache().get_or_set(
+        PAGE_CACHE_VERSION_KEY, time.time_ns, None
+    )
+
+
+def get_page_cache_key(request) -> str:
+    """Строит ключ кэша по пути и строке запроса."""
+    version = get_page_cache_version()
+    path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'page:{version}:{path_hash}'
+
+
+def invalidate_page_cache() -> None:
+    """Делает устаревшими все закэшированные страницы."""
+    get_page_cache().set(PAGE_CACHE_VERSION_KEY, time.time_ns(), None)
+
+
+class AnonymousPageCacheMixin:
+    """
+    Миксин кэширует страницу целиком для анонимных пользователей.
+
+    Кэшируются только успешные GET- и HEAD-запросы без cookies в ответе.
+    Кэш сбрасывается сигналами при изменении контента блога.
+    Страница из реплики не кэшируется, пока реплика может отставать
+    от последнего изменения.
+    На условный запрос по закэшированной странице с ETag или
+    Last-Modified отвечает 304 без обращения к БД.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        cache = get_page_cache()
+        key = get_page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            return get_conditional_response(
+                request,
+                etag=response.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    response.get('Last-Modified')
+                ),
+                response=response,
+            )
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200 or response.streaming:
+            return response
+
+        def store(response):
+            if response.cookies:
+                return
+            if getattr(request, 'read_from_replicas', False) and (
+                replica_may_lag(get_page_cache_version())
+            ):
+                return
+            cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+
+        if callable(getattr(response, 'render', None)):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        return response
@@ -0,0 +1,35 @@
+"""
+Настройка соединений с SQLite при их открытии.
+
+Включается настройкой SQLITE_TUNING = True. Отдельные значения
+из DEFAULT_SQLITE_PRAGMAS переопределяются словарём SQLITE_PRAGMAS.
+"""
+from django.conf import settings
+
+# WAL позволяет читать во время записи, synchronous=NORMAL в режиме WAL
+# не теряет целостность БД, а busy_timeout даёт писателям дождаться
+# освобождения блокировки вместо немедленной ошибки.
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 128 * 1024 * 1024,
+    # Отрицательное значение — размер в КиБ, а не в страницах.
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
+
+def get_sqlite_pragmas() -> dict:
+    """Возвращает прагмы, которые нужно выполнить для соединения."""
+    if not settings.SQLITE_TUNING:
+        return {}
+    return {**DEFAULT_SQLITE_PRAGMAS, **settings.SQLITE_PRAGMAS}
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Обработчик сигнала connection_created."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_sqlite_pragmas().items():
+            cursor.execute(f'PRAGMA {name} = {value}')
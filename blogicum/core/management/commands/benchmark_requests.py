@@ -0,0 +1,130 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.utils import get_random_secret_key
+
+from blogicum.profiles import PROFILES
+from core.benchmarks import (BenchmarkError, get_benchmark_cases, run_case,
+                             seed_database, temporary_database)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет запросы benchmark_suite на временной БД в текущем '
+        'профиле настроек или сравнивает несколько профилей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=30,
+            help='Сколько раз выполнить каждый запрос.',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=3,
+            help='Сколько запросов не учитывать в начале замера.',
+        )
+        parser.add_argument(
+            '--posts',
+            type=int,
+            default=30,
+            help='Сколько постов создать во временной БД.',
+        )
+        parser.add_argument(
+            '--profiles',
+            nargs='+',
+            choices=PROFILES,
+            help='Сравнить профили, запустив замер для каждого '
+                 'в отдельном процессе.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Вывести результат в формате JSON.',
+        )
+
+    def handle(self, *args, **options):
+        if options['posts'] < 1:
+            raise CommandError('Число постов должно быть положительным.')
+        if options['requests'] < 2:
+            raise CommandError('Нужно хотя бы два запроса на страницу.')
+        if options['profiles']:
+            results = {
+                profile: self.run_profile(profile, options)
+                for profile in options['profiles']
+            }
+        else:
+            results = {settings.PROFILE: self.measure(options)}
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+        else:
+            self.write_table(results)
+
+    def run_profile(self, profile: str, options) -> dict:
+        """Запускает замер в отдельном процессе с профилем profile."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = {
+                **os.environ,
+                'BLOGICUM_PROFILE': profile,
+                'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+                'DJANGO_CACHE_DIR': cache_dir,
+            }
+            env.setdefault('DJANGO_SECRET_KEY', get_random_secret_key())
+            process = subprocess.run(
+                [
+                    sys.executable, str(settings.BASE_DIR / 'manage.py'),
+                    'benchmark_requests', '--json',
+                    '--requests', str(options['requests']),
+                    '--warmup', str(options['warmup']),
+                    '--posts', str(options['posts']),
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+        if process.returncode:
+            raise CommandError(
+                f'Замер в профиле {profile} завершился с ошибкой:\n'
+                f'{process.stderr}'
+            )
+        return json.loads(process.stdout)[profile]
+
+    def measure(self, options) -> dict:
+        """Замеряет запросы benchmark_suite на временной БД."""
+        with temporary_database():
+            objects = seed_database(posts=options['posts'])
+            try:
+                return {
+                    case.label: run_case(
+                        case, objects.author,
+                        options['requests'], options['warmup'],
+                    )
+                    for case in get_benchmark_cases(objects)
+                }
+            except BenchmarkError as error:
+                raise CommandError(str(error))
+
+    def write_table(self, results: dict) -> None:
+        profiles = list(results)
+        header = f'{"Запрос":<56}' + ''.join(
+            f'{profile:>12}' for profile in profiles
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for label in results[profiles[0]]:
+            self.stdout.write(f'{label:<56}' + ''.join(
+                f'{results[profile][label]["p50"]:>12.2f}'
+                for profile in profiles
+            ))
+        self.stdout.write(
+            'Медиана времени ответа в миллисекундах; остальные '
+            'перцентили и SQL-запросы доступны в выводе --json.'
+        )
@@ -0,0 +1,152 @@
+import json
+import platform
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog.paginators import invalidate_feed_counts
+from core.benchmarks import (BenchmarkError, compare_results,
+                             get_benchmark_cases, get_git_revision, run_case,
+                             seed_database, temporary_database)
+from core.cache import invalidate_page_cache
+
+SCALE_OPTIONS = {
+    'users': 20,
+    'categories': 5,
+    'locations': 5,
+    'posts': 500,
+    'comments': 2000,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет временную БД синтетическими данными и замеряет все '
+        'страницы блога, статические страницы и страницы входа: '
+        'перцентили времени ответа, SQL-запросы и пропускную способность.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in SCALE_OPTIONS.items():
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Сколько объектов создать: {name}.',
+            )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=30,
+            help='Сколько раз выполнить каждый запрос.',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=3,
+            help='Сколько запросов не учитывать в начале замера.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Сохранить результат в JSON-файл.',
+        )
+        parser.add_argument(
+            '--compare',
+            help='Сравнить с результатом из JSON-файла.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=10.0,
+            help='Рост медианы в процентах, который считается регрессией.',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2:
+            raise CommandError('Нужно хотя бы два запроса на страницу.')
+        previous = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as file:
+                    previous = json.load(file)
+            except (OSError, ValueError) as error:
+                raise CommandError(f'Не удалось прочитать результат: {error}')
+
+        scale = {name: options[name] for name in SCALE_OPTIONS}
+        with temporary_database():
+            try:
+                results = self.measure(scale, options)
+            except BenchmarkError as error:
+                raise CommandError(str(error))
+            finally:
+                invalidate_page_cache()
+                invalidate_feed_counts()
+        report = {
+            'meta': {
+                'revision': get_git_revision(),
+                'created_at': timezone.now().isoformat(),
+                'profile': settings.PROFILE,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'requests': options['requests'],
+                'warmup': options['warmup'],
+            },
+            'scale': scale,
+            'results': results,
+        }
+        self.write_table(results)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+        if previous is not None:
+            self.write_comparison(
+                compare_results(previous, report, options['threshold'])
+            )
+
+    def measure(self, scale: dict, options) -> dict:
+        if options['verbosity']:
+            self.stderr.write('Заполнение БД: ' + ', '.join(
+                f'{name} {value}' for name, value in scale.items()
+            ))
+        objects = seed_database(**scale)
+        results = {}
+        for case in get_benchmark_cases(objects):
+            if options['verbosity'] > 1:
+                self.stderr.write(case.label)
+            results[case.label] = run_case(
+                case, objects.author, options['requests'], options['warmup']
+            )
+        return results
+
+    def write_table(self, results: dict) -> None:
+        header = (
+            f'{"Запрос":<56}{"p50":>9}{"p95":>9}{"p99":>9}'
+            f'{"SQL":>7}{"в сек.":>9}'
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for label, result in results.items():
+            self.stdout.write(
+                f'{label:<56}{result["p50"]:>9.2f}{result["p95"]:>9.2f}'
+                f'{result["p99"]:>9.2f}{result["queries"]:>7.1f}'
+                f'{result["throughput"]:>9.0f}'
+            )
+        self.stdout.write('Время ответа в миллисекундах.')
+
+    def write_comparison(self, rows: list) -> None:
+        self.stdout.write('')
+        regressions = 0
+        for label, old, new, change, old_queries, queries, slower in rows:
+            line = (
+                f'{label:<56}{old:>9.2f} → {new:>9.2f} мс '
+                f'({change:+.0f}%), SQL {old_queries:.1f} → {queries:.1f}'
+            )
+            if slower:
+                regressions += 1
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+        if regressions:
+            raise CommandError(f'Найдено регрессий: {regressions}.')
+        self.stdout.write('Регрессий нет.')
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.paginators import invalidate_feed_counts
+from blog.search import get_search_backend
+from blog.utils import recount_comments
+from core.cache import invalidate_page_cache
+from core.fixtures import (BATCH_SIZE, CHUNK_SIZE, LOADABLE_MODELS,
+                           BulkFixtureLoader, iter_fixture_objects,
+                           open_fixture)
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро загружает JSON-фикстуру в формате dumpdata с моделями '
+        f'{", ".join(LOADABLE_MODELS)}. Остальные модели пропускаются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture', help='Путь к .json или .json.gz.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Сколько объектов вставлять одним INSERT.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Сколько объектов сохранять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать объекты, id которых уже есть в БД.',
+        )
+
+    def handle(self, *args, **options):
+        loader = BulkFixtureLoader(
+            batch_size=options['batch_size'],
+            chunk_size=options['chunk_size'],
+            ignore_conflicts=options['ignore_conflicts'],
+        )
+        try:
+            with open_fixture(options['fixture']) as file:
+                loader.load(iter_fixture_objects(file))
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Не удалось загрузить фикстуру: {error}')
+
+        # bulk_create не отправляет сигналы, поэтому производные данные
+        # обновляются один раз после загрузки.
+        recount_comments()
+        get_search_backend().rebuild()
+        invalidate_feed_counts()
+        invalidate_page_cache()
+
+        for label, count in sorted(loader.loaded.items()):
+            self.stdout.write(f'{label}: {count}')
+        for label, count in sorted(loader.skipped.items()):
+            self.stdout.write(f'{label}: пропущено {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {sum(loader.loaded.values())} '
+            f'за {loader.elapsed:.2f} с '
+            f'({loader.rows_per_second:.0f} в секунду)'
+        ))
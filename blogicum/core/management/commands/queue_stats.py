@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Job
+from core.tasks import get_queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает состояние очереди фоновых задач.'
+
+    def handle(self, *args, **options):
+        stats = get_queue_stats()
+        for status, label in Job.Status.choices:
+            self.stdout.write(f'{label}: {stats[status]}')
+        self.stdout.write(f'Ждут выполнения сейчас: {stats["due"]}')
+        self.stdout.write(
+            'Самая старая ждёт, с: '
+            f'{stats["oldest_due_age"]:.0f}'
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from core.tasks import run_workers
+
+
+class Command(BaseCommand):
+    help = 'Запускает обработчики очереди фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Количество потоков-обработчиков.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза между опросами пустой очереди в секундах.',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Завершиться, когда очередь опустеет.',
+        )
+
+    def handle(self, *args, **options):
+        run_workers(
+            workers=options['workers'],
+            interval=options['interval'],
+            burst=options['burst'],
+        )
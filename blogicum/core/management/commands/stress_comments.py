@@ -0,0 +1,118 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Category, Comment, Post
+from core.benchmarks import temporary_database
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест: параллельные авторы отправляют комментарии '
+        'через CommentCreateView на временной SQLite БД без настройки '
+        'соединений и с SQLITE_TUNING.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=8,
+            help='Сколько потоков одновременно отправляют комментарии.',
+        )
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=50,
+            help='Сколько комментариев отправляет каждый поток.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Тест предназначен только для SQLite.')
+        if options['writers'] < 1 or options['comments'] < 1:
+            raise CommandError(
+                'Число потоков и комментариев должно быть положительным.'
+            )
+        self.stdout.write(
+            f'{"Режим":<20}{"комм./с":>12}{"успешно":>10}{"ошибок":>10}'
+        )
+        for label, tuning in (
+            ('без настройки', False), ('SQLITE_TUNING', True)
+        ):
+            with override_settings(SQLITE_TUNING=tuning):
+                created, errors, elapsed = self.run_writers(
+                    options['writers'], options['comments']
+                )
+            self.stdout.write(
+                f'{label:<20}{created / elapsed:>12.1f}'
+                f'{created:>10}{errors:>10}'
+            )
+
+    def run_writers(self, writers: int, comments: int):
+        """Возвращает число комментариев, ошибок и время в секундах."""
+        with temporary_database():
+            category = Category.objects.create(
+                title='Категория', description='Описание', slug='stress'
+            )
+            author = User.objects.create_user('stress')
+            post = Post.objects.create(
+                title='Пост', text='Текст', pub_date=timezone.now(),
+                author=author, category=category,
+            )
+            users = [
+                User.objects.create_user(f'writer{number}')
+                for number in range(writers)
+            ]
+            url = reverse('blog:add_comment', args=(post.id,))
+            errors = []
+            barrier = threading.Barrier(writers + 1)
+            threads = [
+                threading.Thread(
+                    target=self.write_comments,
+                    args=(user, url, comments, barrier, errors),
+                )
+                for user in users
+            ]
+            for thread in threads:
+                thread.start()
+            barrier.wait()
+            start = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            created = Comment.objects.count()
+            post.refresh_from_db()
+            if post.comment_count != created:
+                raise CommandError(
+                    'Счётчик комментариев разошёлся с их числом: '
+                    f'{post.comment_count} != {created}.'
+                )
+            connection.close()
+        return created, len(errors), elapsed
+
+    @staticmethod
+    def write_comments(user, url, comments, barrier, errors):
+        try:
+            client = Client(raise_request_exception=False)
+            client.force_login(user)
+        except Exception:
+            barrier.abort()
+            connection.close()
+            raise
+        try:
+            barrier.wait()
+            for number in range(comments):
+                response = client.post(url, {'text': f'Комментарий {number}'})
+                if response.status_code != 302:
+                    errors.append(response.status_code)
+        finally:
+            connection.close()
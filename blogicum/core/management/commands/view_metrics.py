@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.metrics import get_view_stats, reset_view_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает число SQL-запросов, время в БД, время отрисовки '
+        'шаблонов и время ответа по представлениям.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Вывести метрики в формате JSON.',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Сбросить собранные метрики.',
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_view_stats()
+            self.stdout.write('Метрики сброшены.')
+            return
+        summaries = {
+            view_name: stats.summary()
+            for view_name, stats in get_view_stats().items()
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(summaries, ensure_ascii=False))
+            return
+        if not summaries:
+            self.stdout.write('Метрик пока нет.')
+            return
+
+        header = (
+            f'{"Представление":<28}{"запросов":>10}{"SQL ср.":>9}'
+            f'{"SQL макс.":>10}{"БД p95":>9}{"шабл. p95":>10}'
+            f'{"p50":>9}{"p95":>9}{"сверх бюджета":>15}'
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for view_name, summary in summaries.items():
+            self.stdout.write(
+                f'{view_name:<28}{summary["requests"]:>10}'
+                f'{summary["queries"]["mean"]:>9.1f}'
+                f'{summary["queries"]["max"]:>10.0f}'
+                f'{summary["db_ms"]["p95"]:>9.1f}'
+                f'{summary["template_ms"]["p95"]:>10.1f}'
+                f'{summary["total_ms"]["p50"]:>9.1f}'
+                f'{summary["total_ms"]["p95"]:>9.1f}'
+                f'{summary["over_budget"]:>15}'
+            )
+        self.stdout.write(
+            'Время в миллисекундах; перцентили — верхние границы '
+            'корзин гистограмм.'
+        )
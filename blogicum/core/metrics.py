@@ -0,0 +1,307 @@
+"""
+Метрики запросов по представлениям.
+
+ViewMetricsMiddleware считает для каждого запроса число SQL-запросов,
+время в БД, время отрисовки шаблонов и общее время ответа и
+складывает их в гистограммы по имени представления (blog:index, ...).
+Гистограммы хранятся в памяти процесса и раз в METRICS_PUBLISH_SECONDS
+публикуются в кэш, чтобы страница метрик и команда view_metrics
+видели данные всех процессов сервера. Запросы сверх бюджета
+QUERY_BUDGET записываются в лог.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.template.backends.django import Template
+
+METRICS_CACHE_KEY = 'view-metrics'
+METRICS_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Границы корзин гистограмм; последняя корзина — всё, что больше.
+MS_BOUNDS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BOUNDS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+METRICS = {
+    'queries': QUERY_BOUNDS,
+    'db_ms': MS_BOUNDS,
+    'template_ms': MS_BOUNDS,
+    'total_ms': MS_BOUNDS,
+}
+
+logger = logging.getLogger(__name__)
+
+_current_sample = ContextVar('current_sample', default=None)
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин."""
+
+    def __init__(self, bounds: tuple, counts=None, total=0.0, maximum=0.0):
+        self.bounds = tuple(bounds)
+        self.counts = list(counts or [0] * (len(self.bounds) + 1))
+        self.total = total
+        self.maximum = maximum
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: 'Histogram') -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+    def percentile(self, fraction: float) -> float:
+        """Верхняя граница корзины, в которую попадает перцентиль."""
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.maximum)
+                return self.maximum
+        return 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'bounds': self.bounds,
+            'counts': self.counts,
+            'total': self.total,
+            'max': self.maximum,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Histogram':
+        return cls(data['bounds'], data['counts'], data['total'], data['max'])
+
+
+class ViewStats:
+    """Гистограммы метрик одного представления."""
+
+    def __init__(self, histograms=None, over_budget=0):
+        self.histograms = histograms or {
+            name: Histogram(bounds) for name, bounds in METRICS.items()
+        }
+        self.over_budget = over_budget
+
+    @property
+    def requests(self) -> int:
+        return self.histograms['total_ms'].count
+
+    def merge(self, other: 'ViewStats') -> None:
+        for name, histogram in other.histograms.items():
+            self.histograms[name].merge(histogram)
+        self.over_budget += other.over_budget
+
+    def summary(self) -> dict:
+        return {
+            'requests': self.requests,
+            'over_budget': self.over_budget,
+            **{
+                name: {
+                    'mean': histogram.mean,
+                    'p50': histogram.percentile(0.5),
+                    'p95': histogram.percentile(0.95),
+                    'p99': histogram.percentile(0.99),
+                    'max': histogram.maximum,
+                }
+                for name, histogram in self.histograms.items()
+            },
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            'histograms': {
+                name: histogram.to_dict()
+                for name, histogram in self.histograms.items()
+            },
+            'over_budget': self.over_budget,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ViewStats':
+        return cls(
+            {
+                name: Histogram.from_dict(histogram)
+                for name, histogram in data['histograms'].items()
+            },
+            data['over_budget'],
+        )
+
+
+class MetricsRegistry:
+    """Метрики представлений в памяти процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+        self.published_at = time.monotonic()
+
+    @property
+    def process_key(self) -> str:
+        return f'{METRICS_CACHE_KEY}:{os.uname().nodename}:{os.getpid()}'
+
+    def record(self, view_name: str, sample: 'RequestSample',
+               over_budget: bool) -> None:
+        with self.lock:
+            stats = self.views.setdefault(view_name, ViewStats())
+            for name in METRICS:
+                stats.histograms[name].observe(getattr(sample, name))
+            stats.over_budget += over_budget
+        elapsed = time.monotonic() - self.published_at
+        if elapsed >= settings.METRICS_PUBLISH_SECONDS:
+            self.publish()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                view_name: stats.to_dict()
+                for view_name, stats in self.views.items()
+            }
+
+    def publish(self) -> None:
+        """Публикует метрики процесса в кэш."""
+        self.published_at = time.monotonic()
+        cache.set(self.process_key, self.snapshot(), METRICS_CACHE_TIMEOUT)
+        # Список процессов обновляется без блокировки: при гонке
+        # процесс попадёт в список при следующей публикации.
+        keys = cache.get(METRICS_CACHE_KEY, set())
+        if self.process_key not in keys:
+            cache.set(
+                METRICS_CACHE_KEY, keys | {self.process_key},
+                METRICS_CACHE_TIMEOUT,
+            )
+
+    def reset(self) -> None:
+        with self.lock:
+            self.views.clear()
+
+
+registry = MetricsRegistry()
+
+
+def get_view_stats() -> dict:
+    """Собирает метрики всех процессов: имя представления → ViewStats."""
+    registry.publish()
+    keys = cache.get(METRICS_CACHE_KEY, set())
+    merged = {}
+    for snapshot in cache.get_many(keys).values():
+        for view_name, data in snapshot.items():
+            stats = ViewStats.from_dict(data)
+            if view_name in merged:
+                merged[view_name].merge(stats)
+            else:
+                merged[view_name] = stats
+    return dict(sorted(merged.items()))
+
+
+def reset_view_stats() -> None:
+    """Сбрасывает метрики этого процесса и опубликованные в кэше."""
+    registry.reset()
+    cache.delete_many(cache.get(METRICS_CACHE_KEY, set()))
+    cache.delete(METRICS_CACHE_KEY)
+
+
+def get_query_budget(view_name: str) -> int:
+    return settings.QUERY_BUDGETS.get(view_name, settings.QUERY_BUDGET)
+
+
+class RequestSample:
+    """Метрики одного запроса."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.total_ms = 0.0
+        self.rendering = False
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - start) * 1000
+
+
+def _timed_render(render):
+    def wrapper(self, context=None, request=None):
+        sample = _current_sample.get()
+        # Вложенные отрисовки уже входят во время внешней.
+        if sample is None or sample.rendering:
+            return render(self, context, request)
+        sample.rendering = True
+        start = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            sample.template_ms += (time.perf_counter() - start) * 1000
+            sample.rendering = False
+
+    wrapper.timed = True
+    return wrapper
+
+
+def instrument_templates() -> None:
+    """Включает замер времени отрисовки шаблонов Django."""
+    if not getattr(Template.render, 'timed', False):
+        Template.render = _timed_render(Template.render)
+
+
+class ViewMetricsMiddleware:
+    """Собирает метрики запросов по именам представлений."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instrument_templates()
+
+    def __call__(self, request):
+        sample = RequestSample()
+        token = _current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(sample.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current_sample.reset(token)
+        sample.total_ms = (time.perf_counter() - start) * 1000
+
+        match = request.resolver_match
+        if match is not None:
+            self.record(match.view_name, request, sample)
+        return response
+
+    @staticmethod
+    def record(view_name: str, request, sample: RequestSample) -> None:
+        budget = get_query_budget(view_name)
+        over_budget = sample.queries > budget
+        if over_budget:
+            logger.warning(
+                'Представление %s выполнило %d SQL-запросов при бюджете %d '
+                '(%.1f мс в БД, %.1f мс всего): %s',
+                view_name, sample.queries, budget, sample.db_ms,
+                sample.total_ms, request.get_full_path(),
+            )
+        registry.record(view_name, sample, over_budget)
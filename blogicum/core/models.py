@@ -0,0 +1,74 @@
+from django.db import models
+from django.utils import timezone
+
+# Сколько раз по умолчанию выполнять задачу, прежде чем признать её упавшей.
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+class Job(models.Model):
+    """Модель фоновой задачи в очереди."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Выполнена'
+        FAILED = 'failed', 'Ошибка'
+
+    name = models.CharField(max_length=256, verbose_name='Задача')
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Аргументы'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=DEFAULT_MAX_ATTEMPTS,
+        verbose_name='Максимум попыток'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Выполнить не раньше'
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взята в работу'
+    )
+    locked_by = models.CharField(
+        max_length=128,
+        blank=True,
+        verbose_name='Обработчик'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Завершено'
+    )
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at'),
+                name='job_status_run_at_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.id}'
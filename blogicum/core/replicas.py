@@ -0,0 +1,114 @@
+"""
+Чтение из реплик БД для страниц, которые ничего не изменяют.
+
+Реплики перечисляются в настройке REPLICA_DATABASES. Запросы на чтение
+внутри read_from_replicas() уходят в случайную реплику, запись всегда
+идёт в default. После изменяющего запроса пользователь на
+REPLICA_PIN_SECONDS получает cookie и читает только из default,
+чтобы сразу видеть свои изменения, даже если реплика отстаёт.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_PIN_COOKIE = 'primary_pin'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_use_replicas = ContextVar('use_replicas', default=False)
+
+
+def get_replicas() -> list:
+    return list(settings.REPLICA_DATABASES)
+
+
+def replica_may_lag(changed_ns: int) -> bool:
+    """
+    Проверяет, могла ли реплика ещё не получить изменение, сделанное
+    в момент changed_ns (time.time_ns()): как и для cookie чтения
+    из default, отставание считается не больше REPLICA_PIN_SECONDS.
+    """
+    pin_ns = settings.REPLICA_PIN_SECONDS * 10 ** 9
+    return time.time_ns() - changed_ns < pin_ns
+
+
+def reading_from_replicas() -> bool:
+    """Проверяет, уходит ли сейчас чтение в реплики."""
+    return _use_replicas.get() and bool(get_replicas())
+
+
+@contextmanager
+def read_from_replicas():
+    """Направляет чтение внутри блока в реплики."""
+    token = _use_replicas.set(True)
+    try:
+        yield
+    finally:
+        _use_replicas.reset(token)
+
+
+class ReplicaRouter:
+    """Направляет чтение в реплики, а запись — в default."""
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if replicas and _use_replicas.get():
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики хранят копию тех же данных, что и default.
+        return True
+
+
+class ReplicaReadMixin:
+    """
+    Миксин читает данные страницы из реплик.
+
+    Шаблон отрисовывается внутри блока, потому что queryset'ы
+    в контексте вычисляются лениво при отрисовке. Если страница
+    прочитана из реплик, у запроса ставится read_from_replicas.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or REPLICA_PIN_COOKIE in request.COOKIES
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        request.read_from_replicas = bool(get_replicas())
+        with read_from_replicas():
+            response = super().dispatch(request, *args, **kwargs)
+            if callable(getattr(response, 'render', None)):
+                response.render()
+        return response
+
+
+class PrimaryPinMiddleware:
+    """Ставит cookie чтения из default после изменяющих запросов."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and get_replicas()
+        ):
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,275 @@
+"""
+Раздача статики и медиафайлов WSGI-обёрткой над приложением Django.
+
+Запросы к STATIC_URL и MEDIA_URL обслуживаются до маршрутизатора
+и middleware: с ETag, Last-Modified, заголовками кэширования,
+поддержкой Range и заранее сжатыми копиями файлов (.br, .gz).
+Остальные запросы передаются приложению без изменений.
+"""
+import mimetypes
+import os
+import re
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.http import (http_date, parse_etags, parse_http_date_safe,
+                               quote_etag)
+
+from .storage import get_compressed_names
+
+# Статика без хэша в имени может измениться в любой момент.
+UNHASHED_STATIC_MAX_AGE = 60
+
+BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+TEXT_CONTENT_TYPES = ('application/javascript', 'application/json')
+
+
+class Mount(NamedTuple):
+    """Каталог, файлы которого раздаются по префиксу URL."""
+
+    prefix: str
+    root: str
+    max_age: int
+    immutable_names: frozenset = frozenset()
+
+    def get_cache_control(self, name: str) -> str:
+        """Файлы с хэшем в имени кэшируются навсегда."""
+        if name in self.immutable_names:
+            return f'public, max-age={settings.STATIC_MAX_AGE}, immutable'
+        return f'public, max-age={self.max_age}'
+
+
+def get_content_type(path: str) -> str:
+    content_type, _ = mimetypes.guess_type(path)
+    content_type = content_type or 'application/octet-stream'
+    if content_type.startswith('text/') or (
+        content_type in TEXT_CONTENT_TYPES
+    ):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+class FileServingApplication:
+    """WSGI-приложение, раздающее файлы из каталогов mounts."""
+
+    def __init__(self, application, mounts):
+        self.application = application
+        self.mounts = [
+            mount._replace(root=os.path.realpath(mount.root))
+            for mount in mounts
+        ]
+
+    def __call__(self, environ, start_response):
+        if environ['REQUEST_METHOD'] in ('GET', 'HEAD'):
+            path = environ.get('PATH_INFO', '')
+            for mount in self.mounts:
+                if path.startswith(mount.prefix):
+                    response = self.serve(
+                        environ, mount, path[len(mount.prefix):]
+                    )
+                    if response is not None:
+                        status, headers, body = response
+                        start_response(status, headers)
+                        return body
+        return self.application(environ, start_response)
+
+    @staticmethod
+    def find_file(mount: Mount, name: str) -> Optional[str]:
+        """Возвращает путь к файлу name внутри mount или None."""
+        try:
+            name = name.encode('latin-1').decode()
+        except UnicodeError:
+            return None
+        parts = name.split('/')
+        if not name or '\x00' in name or '..' in parts:
+            return None
+        path = os.path.realpath(os.path.join(mount.root, *parts))
+        if not path.startswith(mount.root + os.sep) or not os.path.isfile(
+            path
+        ):
+            return None
+        return path
+
+    def serve(self, environ, mount: Mount, name: str):
+        """Возвращает статус, заголовки и тело ответа или None."""
+        path = self.find_file(mount, name)
+        if path is None:
+            return None
+
+        content_type = get_content_type(path)
+        vary = any(
+            os.path.exists(compressed)
+            for compressed in get_compressed_names(path).values()
+        )
+        range_header = environ.get('HTTP_RANGE')
+        encoding, path, stat = self.choose_encoding(
+            path, environ.get('HTTP_ACCEPT_ENCODING', ''), range_header
+        )
+        etag = quote_etag(
+            f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+            + (f'-{encoding}' if encoding else '')
+        )
+        last_modified = http_date(stat.st_mtime)
+        headers = self.get_common_headers(mount, name, etag, last_modified)
+        if vary:
+            headers.append(('Vary', 'Accept-Encoding'))
+
+        if self.not_modified(environ, etag, stat.st_mtime):
+            return '304 Not Modified', headers, []
+
+        headers += [
+            ('Content-Type', content_type),
+            ('Accept-Ranges', 'bytes'),
+        ]
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+
+        size = stat.st_size
+        start, end = 0, size - 1
+        status = '200 OK'
+        if range_header and self.range_applies(environ, etag, last_modified):
+            byte_range = self.parse_range(range_header, size)
+            if byte_range is False:
+                return '416 Range Not Satisfiable', headers + [
+                    ('Content-Range', f'bytes */{size}'),
+                    ('Content-Length', '0'),
+                ], []
+            if byte_range is not None:
+                start, end = byte_range
+                status = '206 Partial Content'
+                headers.append(
+                    ('Content-Range', f'bytes {start}-{end}/{size}')
+                )
+
+        length = end - start + 1
+        headers.append(('Content-Length', str(length)))
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return status, headers, []
+        file = open(path, 'rb')
+        if length == size and 'wsgi.file_wrapper' in environ:
+            return status, headers, environ['wsgi.file_wrapper'](
+                file, BLOCK_SIZE
+            )
+        return status, headers, self.read_range(file, start, length)
+
+    @staticmethod
+    def get_common_headers(mount: Mount, name: str, etag: str,
+                           last_modified: str) -> list:
+        """Заголовки, общие для ответов 200, 206, 304 и 416."""
+        headers = [
+            ('ETag', etag),
+            ('Last-Modified', last_modified),
+            ('Cache-Control', mount.get_cache_control(name)),
+        ]
+        # Ответы идут в обход SecurityMiddleware, поэтому её заголовок
+        # против угадывания типа загруженных файлов ставится здесь.
+        if settings.SECURE_CONTENT_TYPE_NOSNIFF:
+            headers.append(('X-Content-Type-Options', 'nosniff'))
+        return headers
+
+    @staticmethod
+    def choose_encoding(path: str, accept_encoding: str,
+                        range_header: Optional[str]):
+        """Выбирает сжатую копию файла, которую принимает клиент."""
+        if not range_header:
+            accepted = {
+                value.split(';')[0].strip()
+                for value in accept_encoding.split(',')
+            }
+            for encoding, compressed in get_compressed_names(path).items():
+                if encoding not in accepted:
+                    continue
+                try:
+                    stat = os.stat(compressed)
+                except OSError:
+                    continue
+                return encoding, compressed, stat
+        return None, path, os.stat(path)
+
+    @staticmethod
+    def not_modified(environ, etag: str, mtime: float) -> bool:
+        """Проверяет заголовки If-None-Match и If-Modified-Since."""
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or etag.strip('"') in (
+                value.removeprefix('W/').strip('"') for value in etags
+            )
+        since = parse_http_date_safe(
+            environ.get('HTTP_IF_MODIFIED_SINCE', '')
+        )
+        return since is not None and int(mtime) <= since
+
+    @staticmethod
+    def range_applies(environ, etag: str, last_modified: str) -> bool:
+        """Проверяет заголовок If-Range."""
+        if_range = environ.get('HTTP_IF_RANGE')
+        return not if_range or if_range in (etag, last_modified)
+
+    @staticmethod
+    def parse_range(range_header: str, size: int):
+        """
+        Разбирает заголовок Range с одним диапазоном байтов.
+
+        Возвращает (начало, конец), None, если заголовок нужно
+        проигнорировать, или False, если диапазон вне файла.
+        """
+        match = RANGE_RE.match(range_header.strip())
+        if match is None:
+            return None
+        first, last = match.groups()
+        if not first:
+            if not last:
+                return None
+            suffix = int(last)
+            if not suffix:
+                return False
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size:
+            return False
+        if start > end:
+            return None
+        return start, end
+
+    @staticmethod
+    def read_range(file, start: int, length: int):
+        with file:
+            file.seek(start)
+            while length > 0:
+                chunk = file.read(min(BLOCK_SIZE, length))
+                if not chunk:
+                    break
+                length -= len(chunk)
+                yield chunk
+
+
+def get_mounts() -> list:
+    """Возвращает раздаваемые каталоги из настроек проекта."""
+    mounts = []
+    if settings.STATIC_URL and settings.STATIC_ROOT:
+        mounts.append(Mount(
+            prefix=settings.STATIC_URL,
+            root=str(settings.STATIC_ROOT),
+            max_age=UNHASHED_STATIC_MAX_AGE,
+            immutable_names=frozenset(
+                getattr(staticfiles_storage, 'hashed_files', {}).values()
+            ),
+        ))
+    if settings.MEDIA_URL and settings.MEDIA_ROOT:
+        mounts.append(Mount(
+            prefix=settings.MEDIA_URL,
+            root=str(settings.MEDIA_ROOT),
+            max_age=settings.MEDIA_MAX_AGE,
+        ))
+    return mounts
+
+
+def get_file_serving_application(application):
+    """Оборачивает WSGI-приложение, если раздача файлов включена."""
+    if not settings.SERVE_FILES:
+        return application
+    return FileServingApplication(application, get_mounts())
@@ -0,0 +1,71 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Какие файлы сжимаются заранее при collectstatic.
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.html', '.ico',
+)
+# Файлы меньше этого размера в байтах сжимать не имеет смысла.
+MIN_COMPRESS_SIZE = 256
+
+
+def get_compressed_names(name: str) -> dict:
+    """Возвращает имена сжатых копий файла по значению Content-Encoding."""
+    return {'br': f'{name}.br', 'gzip': f'{name}.gz'}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Хранилище статики с хэшами в именах файлов и сжатыми копиями.
+
+    После collectstatic рядом с каждым текстовым файлом сохраняются
+    копии .gz и, если установлен пакет brotli, .br.
+    Пока collectstatic не запускался, отдаются исходные имена файлов.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in paths:
+            hashed_name = self.hashed_files.get(self.hash_key(name))
+            for file_name in filter(None, (name, hashed_name)):
+                for compressed_name in self.compress(file_name):
+                    yield name, compressed_name, True
+
+    def compress(self, name: str) -> list:
+        """Сохраняет сжатые копии файла и возвращает их имена."""
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return []
+        with self.open(name) as file:
+            content = file.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return []
+        compressors = {'gzip': lambda data: gzip.compress(data, 9, mtime=0)}
+        if brotli is not None:
+            compressors['br'] = brotli.compress
+        saved = []
+        for encoding, compressed_name in get_compressed_names(name).items():
+            if encoding not in compressors:
+                continue
+            compressed = compressors[encoding](content)
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            saved.append(
+                self._save(compressed_name, ContentFile(compressed))
+            )
+        return saved
@@ -0,0 +1,217 @@
+"""
+Очередь фоновых задач с хранением в БД.
+
+Задача — функция, отмеченная декоратором @task в модуле tasks.py
+любого приложения. Она ставится в очередь вызовом enqueue(функция, **kwargs)
+и выполняется обработчиками из команды run_workers.
+Аргументы задачи должны сериализоваться в JSON.
+"""
+import logging
+import os
+import socket
+import threading
+import traceback
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.db import connection
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from .models import DEFAULT_MAX_ATTEMPTS, Job
+
+logger = logging.getLogger(__name__)
+
+# Задержка перед повтором растёт как RETRY_BASE_DELAY * 2 ** (попытка - 1).
+RETRY_BASE_DELAY = 5
+RETRY_MAX_DELAY = 60 * 60
+# Через сколько секунд задача в статусе running считается брошенной.
+STALE_JOB_TIMEOUT = 60 * 30
+# Сколько задач-кандидатов просматривает обработчик за один захват.
+CLAIM_BATCH_SIZE = 10
+
+_registry = {}
+
+
+def task(func: Optional[Callable] = None, *,
+         max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+    """Регистрирует функцию как фоновую задачу."""
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts
+        _registry[func.task_name] = func
+        return func
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def enqueue(func: Callable, **kwargs) -> Job:
+    """Ставит зарегистрированную задачу в очередь."""
+    if getattr(func, 'task_name', None) not in _registry:
+        raise ValueError(f'{func!r} не зарегистрирована декоратором @task.')
+    return Job.objects.create(
+        name=func.task_name,
+        payload=kwargs,
+        max_attempts=func.max_attempts,
+    )
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    """Возвращает паузу перед следующей попыткой выполнения задачи."""
+    return timedelta(
+        seconds=min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+    )
+
+
+def claim_job(worker_id: str) -> Optional[Job]:
+    """
+    Забирает из очереди одну задачу, время которой наступило.
+
+    Задача переводится в статус running условным UPDATE, поэтому
+    одну и ту же задачу не возьмут два обработчика, даже в разных
+    процессах и без SELECT ... FOR UPDATE.
+    """
+    now = timezone.now()
+    candidates = Job.objects.filter(
+        status=Job.Status.PENDING,
+        run_at__lte=now,
+    ).order_by('run_at', 'id').values_list('id', flat=True)
+    for job_id in candidates[:CLAIM_BATCH_SIZE]:
+        claimed = Job.objects.filter(
+            id=job_id,
+            status=Job.Status.PENDING,
+        ).update(
+            status=Job.Status.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_at=now,
+            locked_by=worker_id,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def run_job(job: Job) -> bool:
+    """
+    Выполняет задачу и записывает результат.
+
+    При ошибке задача возвращается в очередь с увеличивающейся паузой,
+    пока не исчерпан лимит попыток. Возвращает True при успехе.
+    """
+    func = _registry.get(job.name)
+    try:
+        if func is None:
+            raise LookupError(f'Задача {job.name} не зарегистрирована.')
+        func(**job.payload)
+    except Exception:
+        logger.exception('Задача %s завершилась с ошибкой', job)
+        now = timezone.now()
+        failed = job.attempts >= job.max_attempts
+        Job.objects.filter(id=job.id).update(
+            status=Job.Status.FAILED if failed else Job.Status.PENDING,
+            run_at=now if failed else now + get_retry_delay(job.attempts),
+            finished_at=now if failed else None,
+            locked_at=None,
+            locked_by='',
+            last_error=traceback.format_exc(),
+        )
+        return False
+    Job.objects.filter(id=job.id).update(
+        status=Job.Status.DONE,
+        finished_at=timezone.now(),
+        locked_at=None,
+        locked_by='',
+    )
+    return True
+
+
+def requeue_stale_jobs() -> int:
+    """Возвращает в очередь задачи, брошенные упавшими обработчиками."""
+    return Job.objects.filter(
+        status=Job.Status.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=STALE_JOB_TIMEOUT),
+    ).update(status=Job.Status.PENDING, locked_at=None, locked_by='')
+
+
+def work_off(worker_id: str = 'work_off',
+             max_jobs: Optional[int] = None) -> int:
+    """
+    Выполняет в текущем потоке все задачи, время которых наступило.
+
+    Возвращает количество выполненных задач.
+    """
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = claim_job(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+def _work(worker_id: str, interval: float, burst: bool,
+          stop_event: threading.Event) -> None:
+    try:
+        while not stop_event.is_set():
+            if not work_off(worker_id, max_jobs=1):
+                if burst:
+                    break
+                stop_event.wait(interval)
+    finally:
+        connection.close()
+
+
+def run_workers(workers: int = 1, interval: float = 1.0, burst: bool = False,
+                stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Запускает пул потоков-обработчиков очереди.
+
+    В режиме burst обработчики завершаются, когда очередь опустела,
+    иначе работают, пока не установлен stop_event.
+    """
+    stop_event = stop_event or threading.Event()
+    requeue_stale_jobs()
+    prefix = f'{socket.gethostname()}:{os.getpid()}'
+    threads = [
+        threading.Thread(
+            target=_work,
+            args=(f'{prefix}:{number}', interval, burst, stop_event),
+            name=f'worker-{number}',
+            daemon=True,
+        )
+        for number in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=interval)
+    except KeyboardInterrupt:
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+
+def get_queue_stats() -> dict:
+    """
+    Возвращает количество задач по статусам, число задач, ждущих
+    выполнения прямо сейчас, и возраст самой старой из них в секундах.
+    """
+    now = timezone.now()
+    stats = {status: 0 for status in Job.Status.values}
+    stats.update(
+        Job.objects.order_by().values_list('status').annotate(
+            total=Count('id')
+        )
+    )
+    due = Job.objects.filter(status=Job.Status.PENDING, run_at__lte=now)
+    oldest = due.aggregate(oldest=Min('run_at'))['oldest']
+    stats['due'] = due.count()
+    stats['oldest_due_age'] = (
+        (now - oldest).total_seconds() if oldest else 0
+    )
+    return stats
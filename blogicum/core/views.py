@@ -1,13 +1,17 @@
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.db.models import Count
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse, reverse_lazy
 from django.views.generic import CreateView, ListView, UpdateView
 
-from blog.models import Post
+from blog.mixins import FeedPaginationMixin, ObjectCacheMixin
+from blog.utils import get_posts_feed
 from core.forms import UserEditForm
+from core.metrics import get_view_stats
+from core.replicas import ReplicaReadMixin
 
 NUMBER_OF_POSTS = 10
 
@@ -22,7 +26,7 @@ class UserCreateView(CreateView):
     success_url = reverse_lazy('blog:index')
 
 
-class UserListView(ListView):
+class UserListView(ReplicaReadMixin, FeedPaginationMixin, ListView):
     """Представление профиля пользователя."""
 
     model = User
@@ -30,11 +34,9 @@ class UserListView(ListView):
     paginate_by = NUMBER_OF_POSTS
 
     def get_queryset(self):
-        return Post.objects.filter(
+        return get_posts_feed(published_only=False).filter(
             author=get_object_or_404(User, username=self.kwargs['username']).id
-        ).annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -43,22 +45,24 @@ class UserListView(ListView):
         return context
 
 
-class UserUpdateView(UserPassesTestMixin, UpdateView):
+class CurrentUserMixin:
+    """Миксин выбирает объектом представления текущего пользователя."""
+
+    def get_object(self, queryset=None):
+        return get_object_or_404(User, username=self.request.user.username)
+
+
+class UserUpdateView(ObjectCacheMixin, CurrentUserMixin, UserPassesTestMixin,
+                     UpdateView):
     """Представление редактирования профиля пользователя."""
 
     model = User
     form_class = UserEditForm
     template_name = 'blog/profile_edit.html'
 
-    def get_object(self, queryset=None):
-        return get_object_or_404(User, username=self.request.user.username)
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        instance = get_object_or_404(User, id=self.request.user.id)
-        form = UserEditForm(self.request.POST or None, instance=instance)
-        context['profile'] = instance
-        context['form'] = form
+        context['profile'] = self.object
         return context
 
     def test_func(self):
@@ -70,3 +74,12 @@ class UserUpdateView(UserPassesTestMixin, UpdateView):
             'blog:profile',
             kwargs={'username': self.request.user.username}
         )
+
+
+@staff_member_required
+def view_metrics(request):
+    """Метрики запросов по представлениям для персонала."""
+    return JsonResponse({
+        view_name: stats.summary()
+        for view_name, stats in get_view_stats().items()
+    }, json_dumps_params={'ensure_ascii': False})
@@ -1,14 +1,16 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from core.cache import AnonymousPageCacheMixin
 
-class AboutTemplateView(TemplateView):
+
+class AboutTemplateView(AnonymousPageCacheMixin, TemplateView):
     """Представление отображения статичной страницы 'О проекте'."""
 
     template_name = 'pages/about.html'
 
 
-class RulesTemplateView(TemplateView):
+class RulesTemplateView(AnonymousPageCacheMixin, TemplateView):
     """Представление отображения статичной страницы 'Правила'."""
 
     template_name = 'pages/rules.html'
@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+
+def _get(client, url, **params):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return response, ctx.captured_queries
+
+
+@pytest.fixture
+def many_posts(mixer, user, another_user, published_category,
+               published_location):
+    posts = mixer.cycle(N_PER_PAGE).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location,
+    )
+    for post in posts[:3]:
+        mixer.cycle(2).blend('blog.Comment', post=post, author=another_user)
+    return posts
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', (
+    '/admin/blog/post/',
+    '/admin/blog/comment/',
+))
+def test_changelist_queries_do_not_depend_on_rows(
+        mixer, admin_client, post_with_published_location, url
+):
+    mixer.blend('blog.Comment', post=post_with_published_location)
+    _, queries = _get(admin_client, url)
+    expected = len(queries)
+
+    mixer.cycle(N_PER_PAGE).blend(
+        'blog.Comment', post=post_with_published_location
+    )
+    _, queries = _get(admin_client, url)
+    assert len(queries) == expected, (
+        f'Убедитесь, что список `{url}` загружает связанные объекты '
+        'одним запросом.'
+    )
+
+
+@pytest.mark.django_db
+def test_input_filters(admin_client, many_posts, user, another_user):
+    response, _ = _get(admin_client, '/admin/blog/post/')
+    content = response.content.decode('utf-8')
+    assert f'?author__id__exact={another_user.id}' not in content, (
+        'Убедитесь, что фильтр по автору не перечисляет всех пользователей.'
+    )
+
+    response, _ = _get(
+        admin_client, '/admin/blog/post/', author=another_user.username
+    )
+    assert response.context['cl'].result_count == 0
+    response, _ = _get(admin_client, '/admin/blog/post/', author=user.username)
+    assert response.context['cl'].result_count == len(many_posts)
+
+    response, _ = _get(admin_client, '/admin/blog/comment/',
+                       post=many_posts[0].id)
+    assert response.context['cl'].result_count == 2
+    response, _ = _get(admin_client, '/admin/blog/comment/', post='abc')
+    assert response.context['cl'].result_count == 0
+
+
+@pytest.mark.django_db
+def test_estimated_count(settings, admin_client, many_posts, user):
+    settings.ADMIN_ESTIMATED_COUNT_THRESHOLD = 0
+    response, queries = _get(admin_client, '/admin/blog/post/')
+    assert not any('COUNT(' in query['sql'] for query in queries), (
+        'Убедитесь, что число строк большой таблицы оценивается '
+        'без COUNT(*).'
+    )
+    assert response.context['cl'].result_count >= len(many_posts)
+
+    settings.ADMIN_COUNT_LIMIT = 3
+    response, _ = _get(admin_client, '/admin/blog/post/', author=user.username)
+    assert response.context['cl'].result_count == 3, (
+        'Убедитесь, что отфильтрованные строки считаются '
+        'не дальше ADMIN_COUNT_LIMIT.'
+    )
+
+
+@pytest.mark.django_db
+def test_foreign_keys_use_autocomplete(admin_client, many_posts):
+    response, _ = _get(admin_client, '/admin/blog/comment/add/')
+    content = response.content.decode('utf-8')
+    assert 'admin-autocomplete' in content
+    assert many_posts[-1].title not in content, (
+        'Убедитесь, что форма комментария не выводит все посты в списке.'
+    )
@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+
+from blog.models import Comment, Post
+from core.benchmarks import (compare_results, get_benchmark_cases,
+                             get_url_names, run_case, seed_database)
+
+
+@pytest.mark.django_db
+def test_seed_database_and_cases():
+    objects = seed_database(
+        users=3, categories=2, locations=2, posts=15, comments=30
+    )
+    assert Post.objects.count() == 15
+    assert Comment.objects.count() == 31
+    objects.post.refresh_from_db()
+    assert objects.post.comment_count == objects.post.comments.count(), (
+        'Убедитесь, что после заполнения БД пересчитываются счётчики '
+        'комментариев.'
+    )
+
+    cases = get_benchmark_cases(objects)
+    assert {case.url_name for case in cases} == get_url_names(), (
+        'Убедитесь, что замер покрывает все адреса блога, статических '
+        'страниц и аутентификации.'
+    )
+    assert len({case.label for case in cases}) == len(cases)
+
+    for case in cases:
+        result = run_case(case, objects.author, requests=2, warmup=0)
+        assert result['p50'] <= result['p95'] <= result['p99']
+        assert result['throughput'] > 0
+
+
+def test_compare_results():
+    previous = {'results': {
+        'a': {'p50': 10.0, 'queries': 3},
+        'b': {'p50': 10.0, 'queries': 3},
+        'c': {'p50': 10.0, 'queries': 3},
+    }}
+    current = {'results': {
+        'a': {'p50': 10.5, 'queries': 3},
+        'b': {'p50': 15.0, 'queries': 3},
+        'c': {'p50': 9.0, 'queries': 4},
+        'd': {'p50': 1.0, 'queries': 1},
+    }}
+    regressions = {
+        row[0]: row[-1] for row in compare_results(previous, current, 10)
+    }
+    assert regressions == {'a': False, 'b': True, 'c': True}
+
+
+def test_benchmark_suite_command(tmp_path):
+    output = tmp_path / 'results.json'
+    process = subprocess.run(
+        [
+            sys.executable, 'manage.py', 'benchmark_suite',
+            '--users', '2', '--posts', '5', '--comments', '5',
+            '--requests', '2', '--warmup', '0', '--output', str(output),
+        ],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+            'BLOGICUM_PROFILE': 'test',
+        },
+        capture_output=True,
+        text=True,
+    )
+    assert process.returncode == 0, process.stderr
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert report['scale']['posts'] == 5
+    assert report['meta']['profile'] == 'test'
+    assert all(
+        {'p50', 'p95', 'p99', 'queries', 'throughput'} <= result.keys()
+        for result in report['results'].values()
+    )
@@ -0,0 +1,114 @@
+import io
+import json
+from collections import Counter
+
+import pytest
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.utils.dateparse import parse_datetime
+
+from blog.models import Category, Comment, Post
+from blog.utils import get_posts_feed, search_posts
+from core.fixtures import FixtureFormatError, iter_fixture_objects
+
+FIXTURE = settings.BASE_DIR.parent / 'db.json'
+
+
+def _index_names():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name LIKE 'blog_%%'"
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+@pytest.mark.parametrize('read_size', (1, 7, 4096))
+def test_streaming_parser(read_size):
+    with open(FIXTURE, encoding='utf-8') as file:
+        expected = json.load(file)
+    with open(FIXTURE, encoding='utf-8') as file:
+        assert list(iter_fixture_objects(file, read_size)) == expected
+
+
+@pytest.mark.parametrize('content, error', (
+    ('', FixtureFormatError),
+    ('{"model": "blog.post"}', FixtureFormatError),
+    ('[{}, ', FixtureFormatError),
+    ('[{"model": "blog.', json.JSONDecodeError),
+))
+def test_streaming_parser_rejects_broken_fixture(content, error):
+    with pytest.raises(error):
+        list(iter_fixture_objects(io.StringIO(content), 4))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_loaddata(tmp_path, capsys):
+    with open(FIXTURE, encoding='utf-8') as file:
+        objects = json.load(file)
+    post = next(obj for obj in objects if obj['model'] == 'blog.post')
+    author = post['fields']['author']
+    objects += [
+        {
+            'model': 'blog.comment',
+            'pk': number,
+            'fields': {
+                'text': 'Комментарий',
+                'post': post['pk'],
+                'author': author,
+                'created_at': '2023-01-01T00:00:00Z',
+            },
+        }
+        for number in range(1, 4)
+    ]
+    fixture = tmp_path / 'fixture.json'
+    fixture.write_text(json.dumps(objects), encoding='utf-8')
+    indexes = _index_names()
+
+    call_command('bulk_loaddata', str(fixture), '--chunk-size', '10',
+                 '--batch-size', '7')
+
+    counts = Counter(obj['model'] for obj in objects)
+    assert Post.objects.count() == counts['blog.post']
+    assert Comment.objects.count() == 3
+    assert Post.objects.get(pk=post['pk']).comment_count == 3, (
+        'Убедитесь, что после загрузки пересчитываются счётчики '
+        'комментариев.'
+    )
+    assert get_posts_feed().exists(), (
+        'Убедитесь, что загруженные посты с наступившей датой '
+        'публикации попадают в ленту.'
+    )
+    assert search_posts(post['fields']['title']), (
+        'Убедитесь, что после загрузки перестраивается поисковый индекс.'
+    )
+    assert _index_names() == indexes, (
+        'Убедитесь, что индексы создаются заново после загрузки.'
+    )
+    output = capsys.readouterr().out
+    assert 'admin.logentry: пропущено' in output
+    assert 'в секунду' in output
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_loaddata_keeps_timestamps():
+    call_command('bulk_loaddata', str(FIXTURE), verbosity=0)
+    with open(FIXTURE, encoding='utf-8') as file:
+        objects = json.load(file)
+    for obj in objects:
+        if obj['model'] not in ('blog.category', 'blog.location', 'blog.post'):
+            continue
+        model = apps.get_model(obj['model'])
+        loaded = model.objects.get(pk=obj['pk'])
+        for name in ('created_at', 'updated_at'):
+            assert loaded.serializable_value(name) == parse_datetime(
+                obj['fields'][name]
+            ), (
+                'Убедитесь, что даты создания и изменения берутся '
+                'из фикстуры, а не заменяются временем загрузки.'
+            )
+    assert Category.created_at.field.auto_now_add, (
+        'Убедитесь, что после загрузки auto_now_add снова включён.'
+    )
@@ -0,0 +1,79 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+from conftest import N_PER_FIXTURE
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_views(
+        user_client, post_with_published_location, user
+):
+    post = post_with_published_location
+    for i in range(N_PER_FIXTURE):
+        user_client.post(
+            f'/posts/{post.id}/comment/', data={'text': f'Комментарий {i}'}
+        )
+    post.refresh_from_db()
+    assert post.comment_count == N_PER_FIXTURE, (
+        'Убедитесь, что при добавлении комментария увеличивается '
+        'счётчик комментариев поста.'
+    )
+
+    comment = post.comments.first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}')
+    post.refresh_from_db()
+    assert post.comment_count == N_PER_FIXTURE - 1, (
+        'Убедитесь, что при удалении комментария уменьшается '
+        'счётчик комментариев поста.'
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(N_PER_FIXTURE).blend('blog.Comment', post=post)
+    Post.objects.filter(id=post.id).update(comment_count=0)
+
+    call_command('recount_comments')
+    post.refresh_from_db()
+    assert post.comment_count == N_PER_FIXTURE, (
+        'Убедитесь, что команда `recount_comments` восстанавливает '
+        'счётчики комментариев.'
+    )
+
+
+@pytest.mark.django_db
+def test_comment_count_after_admin_bulk_delete(
+        mixer, admin_client, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(N_PER_FIXTURE).blend('blog.Comment', post=post)
+    call_command('recount_comments')
+    admin_client.post('/admin/blog/comment/', data={
+        'action': 'delete_selected',
+        '_selected_action': [comment.id for comment in comments[1:]],
+        'post': 'yes',
+    })
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что массовое удаление комментариев в админке '
+        'обновляет счётчики комментариев.'
+    )
+
+
+@pytest.mark.django_db
+def test_comment_count_after_cascade_delete(
+        mixer, admin_client, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(N_PER_FIXTURE).blend('blog.Comment', post=post)
+    mixer.blend('blog.Comment', post=post, author=another_user)
+    admin_client.post(
+        f'/admin/auth/user/{another_user.id}/delete/', data={'post': 'yes'}
+    )
+    post.refresh_from_db()
+    assert post.comment_count == N_PER_FIXTURE, (
+        'Убедитесь, что при удалении пользователя вместе с его '
+        'комментариями уменьшаются счётчики комментариев.'
+    )
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Comment
+
+NUMBER_OF_COMMENTS = 10
+
+
+@pytest.mark.django_db
+def test_comments_are_loaded_in_batches(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    comments = [
+        mixer.blend('blog.Comment', post=post, text=f'Комментарий №{i}.')
+        for i in range(NUMBER_OF_COMMENTS * 2 + 1)
+    ]
+
+    response = user_client.get(f'/posts/{post.id}/')
+    assert [c.id for c in response.context['comments']] == [
+        c.id for c in comments[-NUMBER_OF_COMMENTS:]
+    ], (
+        'Убедитесь, что на странице поста сразу выводятся только '
+        'самые новые комментарии, от старых к новым.'
+    )
+
+    loaded = list(response.context['comments'])
+    cursor = response.context['comments_cursor']
+    while cursor is not None:
+        response = user_client.get(
+            f'/posts/{post.id}/comments/', {'before': cursor}
+        )
+        assert response.status_code == 200
+        loaded = list(response.context['comments']) + loaded
+        cursor = response.context['comments_cursor']
+    assert loaded == comments, (
+        'Убедитесь, что кнопка «Показать более ранние комментарии» '
+        'подгружает все оставшиеся комментарии.'
+    )
+
+
+@pytest.mark.django_db
+def test_comments_of_hidden_post(
+        mixer, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(
+        f'/posts/{post.id}/comments/', {'before': 1}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_comment_batches_follow_created_at(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(NUMBER_OF_COMMENTS * 2).blend(
+        'blog.Comment', post=post
+    )
+    # Комментарии из импорта: порядок дат не совпадает с порядком id.
+    start = timezone.now() - timedelta(days=1)
+    for minutes, comment in enumerate(reversed(comments)):
+        Comment.objects.filter(id=comment.id).update(
+            created_at=start + timedelta(minutes=minutes)
+        )
+
+    response = user_client.get(f'/posts/{post.id}/')
+    loaded = list(response.context['comments'])
+    response = user_client.get(
+        f'/posts/{post.id}/comments/',
+        {'before': response.context['comments_cursor']},
+    )
+    loaded = list(response.context['comments']) + loaded
+    assert loaded == comments[::-1], (
+        'Убедитесь, что кнопка «Показать более ранние комментарии» '
+        'не пропускает и не повторяет комментарии.'
+    )
+    assert response.context['comments_cursor'] is None
@@ -0,0 +1,124 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Category, Location, Post
+from core.cache import PAGE_CACHE_VERSION_KEY, get_page_cache
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', (
+    '/',
+    '/posts/{post_id}/',
+    '/category/{category}/',
+))
+def test_not_modified(client, post_with_published_location, url):
+    post = post_with_published_location
+    url = url.format(post_id=post.id, category=post.category.slug)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'ETag' in response and 'Last-Modified' in response, (
+        f'Убедитесь, что страница `{url}` отдаёт заголовки ETag '
+        'и Last-Modified.'
+    )
+
+    for headers in (
+        {'HTTP_IF_NONE_MATCH': response['ETag']},
+        {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']},
+    ):
+        not_modified = client.get(url, **headers)
+        assert not_modified.status_code == 304, (
+            f'Убедитесь, что страница `{url}` отвечает 304 Not Modified, '
+            'если она не изменилась.'
+        )
+        assert not_modified.content == b''
+        assert not_modified['ETag'] == response['ETag']
+
+
+@pytest.mark.django_db
+def test_changes_invalidate_validators(
+        mixer, client, user, post_with_published_location
+):
+    post = post_with_published_location
+    feed_etag = client.get('/')['ETag']
+    post_etag = client.get(f'/posts/{post.id}/')['ETag']
+
+    mixer.blend('blog.Comment', post=post)
+    assert client.get(
+        f'/posts/{post.id}/', HTTP_IF_NONE_MATCH=post_etag
+    ).status_code == 200, (
+        'Убедитесь, что новый комментарий меняет ETag страницы поста.'
+    )
+
+    mixer.blend('blog.Post', author=user, category=post.category)
+    assert client.get('/', HTTP_IF_NONE_MATCH=feed_etag).status_code == 200
+
+    feed_etag = client.get('/')['ETag']
+    post.delete()
+    assert client.get('/', HTTP_IF_NONE_MATCH=feed_etag).status_code == 200, (
+        'Убедитесь, что удаление поста меняет ETag ленты.'
+    )
+
+
+@pytest.mark.django_db
+def test_not_modified_for_authenticated_user(
+        user_client, another_user_client, post_with_published_location
+):
+    url = f'/posts/{post_with_published_location.id}/'
+    response = user_client.get(url)
+    assert 'Last-Modified' not in response, (
+        'Убедитесь, что страницы вошедших пользователей проверяются '
+        'только по ETag: они зависят от пользователя.'
+    )
+    assert another_user_client.get(url)['ETag'] != response['ETag']
+
+    not_modified = user_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert not_modified.status_code == 304
+    assert not not_modified.templates, (
+        'Убедитесь, что для ответа 304 шаблон не отрисовывается.'
+    )
+
+
+@pytest.mark.django_db
+def test_last_modified_moves_forward_on_removal(
+        mixer, client, user, post_with_published_location
+):
+    post = post_with_published_location
+    other = mixer.blend('blog.Post', author=user, category=post.category)
+    old = timezone.now() - timedelta(days=1)
+    Post.objects.update(updated_at=old)
+    Category.objects.update(updated_at=old)
+    Location.objects.update(updated_at=old)
+
+    def unpublish_category():
+        category = Category.objects.get(id=post.category_id)
+        category.is_published = False
+        category.save()
+
+    for change in (other.delete, unpublish_category):
+        get_page_cache().set(PAGE_CACHE_VERSION_KEY, time.time_ns() - 10 ** 12)
+        last_modified = client.get('/')['Last-Modified']
+        change()
+        assert client.get(
+            '/', HTTP_IF_MODIFIED_SINCE=last_modified
+        ).status_code == 200, (
+            'Убедитесь, что удаление поста и снятие категории '
+            'с публикации сдвигают '
+            'Last-Modified ленты вперёд.'
+        )
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+@pytest.mark.parametrize('pin_seconds, has_etag', ((10, False), (0, True)))
+def test_no_validators_from_lagging_replica(
+        settings, client, post_with_published_location, pin_seconds, has_etag
+):
+    settings.REPLICA_DATABASES = ['replica']
+    settings.REPLICA_PIN_SECONDS = pin_seconds
+    response = client.get('/')
+    assert ('ETag' in response) == has_etag, (
+        'Убедитесь, что страница из реплики, которая может отставать, '
+        'отдаётся без ETag и Last-Modified.'
+    )
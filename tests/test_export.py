@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from conftest import N_PER_FIXTURE
+
+
+def _export(*args):
+    stdout = io.StringIO()
+    call_command('export_blog', *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_export_jsonl(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(N_PER_FIXTURE).blend('blog.Comment', post=post)
+
+    rows = [
+        json.loads(line)
+        for line in _export('--chunk-size', '2').splitlines()
+    ]
+    models = [row['model'] for row in rows]
+    assert models.count('blog.comment') == N_PER_FIXTURE
+    assert models.count('blog.post') == 1
+    assert {'blog.category', 'blog.location'} <= set(models)
+    exported_post = next(row for row in rows if row['model'] == 'blog.post')
+    assert exported_post['id'] == post.id
+    assert exported_post['title'] == post.title
+    assert exported_post['author_id'] == post.author_id, (
+        'Убедитесь, что связи выгружаются как id связанных объектов.'
+    )
+
+
+@pytest.mark.django_db
+def test_export_csv(tmp_path, mixer, post_with_published_location):
+    mixer.cycle(N_PER_FIXTURE).blend(
+        'blog.Comment', post=post_with_published_location
+    )
+    output = tmp_path / 'comments.csv'
+    call_command('export_blog', '--models', 'comment', '--format', 'csv',
+                 '--output', str(output))
+
+    with open(output, encoding='utf-8', newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == N_PER_FIXTURE
+    assert {row['text'] for row in rows} == set(
+        Comment.objects.values_list('text', flat=True)
+    )
+
+    with pytest.raises(CommandError):
+        _export('--models', 'comment', 'post', '--format', 'csv')
+
+
+@pytest.mark.django_db
+def test_export_since(mixer, post_with_published_location):
+    comments = mixer.cycle(N_PER_FIXTURE).blend(
+        'blog.Comment', post=post_with_published_location
+    )
+    old = timezone.now() - timedelta(days=10)
+    Comment.objects.exclude(id=comments[0].id).update(
+        created_at=old, updated_at=old
+    )
+    Post.objects.update(updated_at=old)
+
+    since = (old + timedelta(days=1)).isoformat()
+    rows = [
+        json.loads(line)
+        for line in _export(
+            '--models', 'comment', 'post', '--since', since
+        ).splitlines()
+    ]
+    assert [row['id'] for row in rows] == [comments[0].id], (
+        'Убедитесь, что с параметром --since выгружаются только строки, '
+        'созданные или изменённые после указанного момента.'
+    )
+
+    with pytest.raises(CommandError):
+        _export('--since', 'вчера')
+
+
+@pytest.mark.django_db
+def test_export_admin_action(admin_client, post_with_published_location):
+    response = admin_client.post('/admin/blog/post/', data={
+        'action': 'export_jsonl',
+        '_selected_action': [post_with_published_location.id],
+    })
+    assert response.streaming, (
+        'Убедитесь, что выгрузка из админки отдаётся потоково.'
+    )
+    assert 'post.jsonl' in response['Content-Disposition']
+    rows = [
+        json.loads(line)
+        for line in b''.join(response.streaming_content).splitlines()
+    ]
+    assert [row['id'] for row in rows] == [post_with_published_location.id]
@@ -0,0 +1,122 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import VARIANT_WIDTHS
+from core.tasks import work_off
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _upload(width, height, name='photo.jpg'):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), color=(73, 109, 137)).save(
+        buffer, format='JPEG'
+    )
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/jpeg')
+
+
+@pytest.mark.django_db
+def test_variants_are_created_on_upload(
+        user_client, published_category, published_location, PostModel
+):
+    response = user_client.post('/posts/create/', data={
+        'title': 'Пост с фото',
+        'text': 'Текст',
+        'pub_date': '2020-01-01T00:00',
+        'category': published_category.id,
+        'location': published_location.id,
+        'is_published': True,
+        'image': _upload(1500, 1000),
+    })
+    assert response.status_code == 302
+    post = PostModel.objects.get(title='Пост с фото')
+    assert post.image_variants == {}, (
+        'Убедитесь, что копии изображения создаются в фоновой задаче, '
+        'а не во время запроса.'
+    )
+    assert work_off() == 1
+    post.refresh_from_db()
+    expected = [str(w) for w in VARIANT_WIDTHS if w < 1500] + ['1500']
+    assert sorted(post.image_variants, key=int) == expected, (
+        'Убедитесь, что при загрузке фото создаются уменьшенные копии, '
+        'но не шире оригинала.'
+    )
+    for names in post.image_variants.values():
+        with post.image.storage.open(names['webp']) as file:
+            assert Image.open(file).format == 'WEBP'
+
+    content = user_client.get('/').content.decode('utf-8')
+    assert 'type="image/webp"' in content
+    assert f'{post.image_variants["640"]["fallback"]} 640w' in content, (
+        'Убедитесь, что в карточке поста выводится атрибут `srcset`.'
+    )
+
+
+@pytest.mark.django_db
+def test_generate_image_variants_command(mixer, user, PostModel):
+    post = mixer.blend('blog.Post', author=user, image=_upload(800, 600))
+    assert post.image_variants == {}
+
+    call_command('generate_image_variants')
+    post.refresh_from_db()
+    assert sorted(post.image_variants, key=int) == ['640', '800']
+
+
+@pytest.mark.django_db
+def test_variants_are_reset_when_image_changes(
+        user_client, published_category, published_location, PostModel
+):
+    data = {
+        'title': 'Пост с фото',
+        'text': 'Текст',
+        'pub_date': '2020-01-01T00:00',
+        'category': published_category.id,
+        'location': published_location.id,
+        'is_published': True,
+    }
+    user_client.post(
+        '/posts/create/', data={**data, 'image': _upload(800, 600)}
+    )
+    work_off()
+    post = PostModel.objects.get(title='Пост с фото')
+    old_variants = post.image_variants
+    assert old_variants
+
+    user_client.post(
+        f'/posts/{post.id}/edit/',
+        data={**data, 'image': _upload(700, 500, 'new.jpg')},
+    )
+    post.refresh_from_db()
+    assert post.image_variants == {}, (
+        'Убедитесь, что при замене фото копии прежнего фото '
+        'сбрасываются до запуска фоновой задачи.'
+    )
+    content = user_client.get('/').content.decode('utf-8')
+    assert old_variants['640']['fallback'] not in content
+    old_names = [
+        name for names in old_variants.values() for name in names.values()
+    ]
+    assert not any(post.image.storage.exists(name) for name in old_names), (
+        'Убедитесь, что файлы копий прежнего фото удаляются.'
+    )
+
+    work_off()
+    post.refresh_from_db()
+    new_names = [
+        name
+        for names in post.image_variants.values()
+        for name in names.values()
+    ]
+    assert new_names
+    user_client.post(f'/posts/{post.id}/delete/')
+    assert not any(post.image.storage.exists(name) for name in new_names), (
+        'Убедитесь, что при удалении поста удаляются файлы копий фото.'
+    )
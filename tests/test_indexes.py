@@ -0,0 +1,51 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment
+from blog.utils import get_posts_feed
+from conftest import N_PER_PAGE
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Планы запросов проверяются только на SQLite.',
+)
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    return mixer.cycle(N_PER_PAGE).blend(
+        'blog.Post', author=user, category=published_category
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('get_queryset, index_name', (
+    (
+        lambda post: get_posts_feed(),
+        'post_published_feed_idx',
+    ),
+    (
+        lambda post: get_posts_feed().filter(
+            category__slug=post.category.slug
+        ),
+        'post_category_feed_idx',
+    ),
+    (
+        lambda post: get_posts_feed(published_only=False).filter(
+            author=post.author_id
+        ),
+        'post_author_feed_idx',
+    ),
+    (
+        lambda post: Comment.objects.filter(post=post),
+        'comment_post_created_idx',
+    ),
+), ids=('index', 'category', 'profile', 'comments'))
+def test_feed_queries_use_indexes(feed_posts, get_queryset, index_name):
+    plan = get_queryset(feed_posts[0])[:N_PER_PAGE].explain()
+    assert f'USING INDEX {index_name}' in plan, (
+        f'Убедитесь, что запрос использует индекс `{index_name}`:\n{plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Убедитесь, что сортировка выполняется по индексу:\n{plan}'
+    )
@@ -0,0 +1,88 @@
+import io
+import json
+import logging
+
+import pytest
+from django.core.management import call_command
+
+from core.cache import invalidate_page_cache
+from core.metrics import Histogram, get_view_stats, reset_view_stats
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    reset_view_stats()
+    yield
+    reset_view_stats()
+
+
+def test_histogram_percentiles():
+    histogram = Histogram((1, 10, 100))
+    for value in (0.5, 5, 5, 5, 50, 500):
+        histogram.observe(value)
+    assert histogram.count == 6
+    assert histogram.percentile(0.5) == 10
+    assert histogram.percentile(0.8) == 100
+    assert histogram.percentile(1) == 500
+    assert histogram.mean == pytest.approx(565.5 / 6)
+
+
+@pytest.mark.django_db
+def test_view_metrics_are_recorded(client, post_with_published_location):
+    client.get('/')
+    client.get('/')
+    client.get(f'/posts/{post_with_published_location.id}/')
+
+    stats = get_view_stats()
+    assert set(stats) == {'blog:index', 'blog:post_detail'}, (
+        'Убедитесь, что метрики собираются по именам представлений.'
+    )
+    summary = stats['blog:index'].summary()
+    assert summary['requests'] == 2
+    assert summary['queries']['max'] > 0
+    assert summary['db_ms']['max'] > 0
+    assert summary['template_ms']['max'] > 0, (
+        'Убедитесь, что учитывается время отрисовки шаблонов.'
+    )
+    assert summary['total_ms']['max'] >= summary['template_ms']['max']
+
+
+@pytest.mark.django_db
+def test_query_budget(settings, client, caplog):
+    settings.QUERY_BUDGET = 0
+    with caplog.at_level(logging.WARNING, logger='core.metrics'):
+        client.get('/')
+    assert 'blog:index' in caplog.text, (
+        'Убедитесь, что запросы сверх бюджета записываются в лог.'
+    )
+    assert get_view_stats()['blog:index'].over_budget == 1
+
+    caplog.clear()
+    invalidate_page_cache()
+    settings.QUERY_BUDGETS = {'blog:index': 100}
+    with caplog.at_level(logging.WARNING, logger='core.metrics'):
+        client.get('/')
+    assert 'blog:index' not in caplog.text, (
+        'Убедитесь, что бюджет можно задать для отдельного представления.'
+    )
+    stats = get_view_stats()['blog:index']
+    assert stats.requests == 2
+    assert stats.over_budget == 1
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_and_command(client, admin_client):
+    client.get('/')
+    assert client.get('/admin/metrics/').status_code == 302, (
+        'Убедитесь, что метрики доступны только персоналу.'
+    )
+    response = admin_client.get('/admin/metrics/')
+    assert response.status_code == 200
+    assert response.json()['blog:index']['requests'] == 1
+
+    stdout = io.StringIO()
+    call_command('view_metrics', '--json', stdout=stdout)
+    assert json.loads(stdout.getvalue())['blog:index']['requests'] == 1
+    stdout = io.StringIO()
+    call_command('view_metrics', stdout=stdout)
+    assert 'blog:index' in stdout.getvalue()
@@ -0,0 +1,128 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+def _get_twice(client, url):
+    first = client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        second = client.get(url)
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', (
+    '/',
+    '/?page=1',
+    '/posts/{post_id}/',
+    '/category/{category}/',
+    '/pages/about/',
+    '/pages/rules/',
+))
+def test_anonymous_pages_are_cached(client, post_with_published_location, url):
+    post = post_with_published_location
+    url = url.format(post_id=post.id, category=post.category.slug)
+    assert _get_twice(client, url) == 0, (
+        f'Убедитесь, что страница `{url}` для анонимного пользователя '
+        'отдаётся из кэша.'
+    )
+
+
+@pytest.mark.django_db
+def test_authenticated_pages_are_not_cached(
+        user_client, post_with_published_location
+):
+    assert _get_twice(user_client, '/') > 0
+
+
+@pytest.mark.django_db
+def test_page_cache_invalidation(
+        mixer, client, user, post_with_published_location
+):
+    post = post_with_published_location
+    client.get('/')
+    client.get(f'/posts/{post.id}/')
+
+    new_post = mixer.blend(
+        'blog.Post', author=user, category=post.category,
+        title='Свежая публикация',
+    )
+    assert new_post.title in client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что кэш ленты сбрасывается при публикации поста.'
+    )
+
+    mixer.blend('blog.Comment', post=post, text='Свежий комментарий')
+    content = client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert 'Свежий комментарий' in content, (
+        'Убедитесь, что кэш страницы поста сбрасывается '
+        'при добавлении комментария.'
+    )
+
+
+@pytest.mark.django_db
+def test_file_based_page_cache(tmp_path, client, post_with_published_location):
+    caches = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'pages': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        },
+    }
+    with override_settings(CACHES=caches, PAGE_CACHE_ALIAS='pages'):
+        assert _get_twice(client, '/') == 0
+    assert any(tmp_path.iterdir())
+
+
+@pytest.mark.django_db
+def test_post_card_is_cached_per_post(
+        user_client, post_with_published_location, PostModel
+):
+    post = post_with_published_location
+    profile_url = f'/profile/{post.author.username}/'
+    user_client.get('/')
+
+    PostModel.objects.filter(id=post.id).update(title='Обновлено в обход')
+    for url in ('/', profile_url):
+        content = user_client.get(url).content.decode('utf-8')
+        assert 'Обновлено в обход' not in content, (
+            'Убедитесь, что карточка поста берётся из кэша и общая '
+            'для всех лент.'
+        )
+
+    post.refresh_from_db()
+    post.title = 'Отредактировано'
+    post.save()
+    content = user_client.get('/').content.decode('utf-8')
+    assert 'Отредактировано' in content, (
+        'Убедитесь, что при редактировании поста его карточка обновляется.'
+    )
+
+    user_client.post(f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    content = user_client.get(profile_url).content.decode('utf-8')
+    assert 'Комментарии (1)' in content, (
+        'Убедитесь, что при добавлении комментария карточка поста '
+        'обновляется.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_follows_related_objects(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get('/')
+
+    post.category.title = 'Новая категория'
+    post.category.save()
+    post.location.name = 'Новое место'
+    post.location.save()
+    content = user_client.get('/').content.decode('utf-8')
+    assert 'Новая категория' in content and 'Новое место' in content, (
+        'Убедитесь, что карточка поста обновляется при изменении '
+        'категории и местоположения.'
+    )
@@ -0,0 +1,80 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+
+def _walk_cursor_pages(client, url, cursor_attr='next_cursor', cursor=''):
+    posts = []
+    while cursor is not None:
+        response = client.get(url, {'cursor': cursor})
+        assert response.status_code == 200
+        page = response.context['page_obj']
+        posts.extend(page)
+        has_more = (
+            page.has_next() if cursor_attr == 'next_cursor'
+            else page.has_previous()
+        )
+        cursor = getattr(page, cursor_attr) if has_more else None
+    return posts
+
+
+@pytest.mark.django_db
+def test_cursor_pages_match_numbered_pages(
+        user_client, many_posts_with_published_locations
+):
+    numbered = []
+    for page in (1, 2):
+        response = user_client.get('/', {'page': page})
+        numbered.extend(response.context['page_obj'])
+
+    assert _walk_cursor_pages(user_client, '/') == numbered, (
+        'Убедитесь, что курсорная пагинация выдаёт те же посты в том же '
+        'порядке, что и постраничная.'
+    )
+    last_page = user_client.get('/', {'cursor': ''}).context['page_obj']
+    backward = _walk_cursor_pages(
+        user_client, '/', 'previous_cursor', last_page.last_cursor
+    )
+    assert sorted(backward, key=numbered.index) == numbered
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_skips_count(
+        user_client, many_posts_with_published_locations
+):
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get('/', {'cursor': ''})
+    assert len(response.context['page_obj']) == N_PER_PAGE
+    assert not any(
+        'COUNT(' in query['sql'] for query in ctx.captured_queries
+    ), 'Убедитесь, что курсорная пагинация не считает общее число постов.'
+    assert 'cursor=' in response.content.decode('utf-8')
+
+
+@pytest.mark.django_db
+def test_invalid_cursor(user_client):
+    assert user_client.get('/', {'cursor': 'not-a-cursor'}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_page_range_is_elided(mixer, user_client, user, published_category):
+    mixer.cycle(N_PER_PAGE * 20).blend(
+        'blog.Post', author=user, category=published_category
+    )
+    content = user_client.get('/', {'page': 10}).content.decode('utf-8')
+    assert content.count('class="page-link"') < 15, (
+        'Убедитесь, что в пагинаторе выводятся не все номера страниц.'
+    )
+    assert '?page=20' in content
+
+
+@pytest.mark.django_db
+def test_feed_count_is_cached(user_client, many_posts_with_published_locations):
+    user_client.get('/')
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.get('/', {'page': 2})
+    assert not any(
+        'COUNT(' in query['sql'] for query in ctx.captured_queries
+    ), 'Убедитесь, что количество постов в ленте берётся из кэша.'
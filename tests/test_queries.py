@@ -0,0 +1,141 @@
+import pytest
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from conftest import N_PER_PAGE
+
+
+def _count_queries(client, url: str) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_feed_queries_do_not_depend_on_posts_number(
+        mixer, user, client, published_category, published_location
+):
+    mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    urls = (
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{user.username}/',
+    )
+    queries_for_one_post = {url: _count_queries(client, url) for url in urls}
+
+    posts = mixer.cycle(N_PER_PAGE).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    for post in posts:
+        mixer.cycle(2).blend('blog.Comment', post=post)
+
+    for url, expected in queries_for_one_post.items():
+        assert _count_queries(client, url) == expected, (
+            f'Убедитесь, что число запросов к БД на странице `{url}` '
+            'не зависит от количества постов на ней.'
+        )
+
+
+@pytest.mark.django_db
+# Лента и категория делают ещё один агрегатный запрос валидаторов
+# условного GET.
+@pytest.mark.parametrize('url, expected', (
+    ('/', 3),
+    ('/category/{category}/', 4),
+    ('/profile/{username}/', 4),
+))
+def test_feed_queries_number(
+        mixer, user, client, published_category, published_location,
+        url, expected
+):
+    mixer.cycle(N_PER_PAGE).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    url = url.format(
+        category=published_category.slug, username=user.username
+    )
+    assert _count_queries(client, url) == expected
+
+
+@pytest.mark.django_db
+def test_post_detail_queries_number(
+        mixer, user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    queries_without_comments = _count_queries(user_client, url)
+
+    mixer.cycle(N_PER_PAGE).blend('blog.Comment', post=post)
+    assert _count_queries(user_client, url) == queries_without_comments, (
+        'Убедитесь, что число запросов к БД на странице поста '
+        'не зависит от количества комментариев.'
+    )
+    # Сессия, пользователь, валидаторы условного GET, пост со связанными
+    # объектами, комментарии.
+    assert queries_without_comments == 5
+
+
+def _count_table_selects(client, url, table, data=None):
+    with CaptureQueriesContext(connection) as ctx:
+        if data is None:
+            client.get(url)
+        else:
+            client.post(url, data=data)
+    return sum(
+        query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+        for query in ctx.captured_queries
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', (
+    '/posts/{post_id}/edit/',
+    '/posts/{post_id}/delete/',
+))
+def test_post_edit_pages_load_post_once(
+        user_client, post_with_published_location, url
+):
+    url = url.format(post_id=post_with_published_location.id)
+    assert _count_table_selects(user_client, url, 'blog_post') == 1, (
+        f'Убедитесь, что страница `{url}` загружает пост из БД один раз.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_edit_submit_loads_post_once(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    data = {
+        'title': 'Новый заголовок',
+        'text': 'Новый текст',
+        'pub_date': '2020-01-01T00:00',
+        'category': post.category_id,
+    }
+    assert _count_table_selects(
+        user_client, f'/posts/{post.id}/edit/', 'blog_post', data
+    ) == 1
+
+
+@pytest.mark.django_db
+def test_profile_edit_loads_user_once(user_client):
+    # Один запрос делает AuthenticationMiddleware, второй — представление.
+    assert _count_table_selects(
+        user_client, '/profile/edit/', 'auth_user'
+    ) == 2, (
+        'Убедитесь, что страница редактирования профиля загружает '
+        'пользователя из БД один раз.'
+    )
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+from core.replicas import (REPLICA_PIN_COOKIE, ReplicaRouter,
+                           read_from_replicas)
+
+pytestmark = pytest.mark.django_db(databases=['default', 'replica'])
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.REPLICA_DATABASES = ['replica']
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post',
+        title='Пост только в основной БД',
+        pub_date=timezone.now() - timedelta(days=1),
+        is_published=True,
+        author=user,
+        category=published_category,
+        location=None,
+    )
+
+
+def _replicate(*objects):
+    for obj in objects:
+        obj.save(using='replica')
+
+
+def test_router(replicas):
+    router = ReplicaRouter()
+    assert router.db_for_read(None) == 'default'
+    with read_from_replicas():
+        assert router.db_for_read(None) == 'replica'
+        assert router.db_for_write(None) == 'default'
+
+
+def test_router_without_replicas():
+    with read_from_replicas():
+        assert ReplicaRouter().db_for_read(None) == 'default'
+
+
+def test_feed_and_detail_read_from_replica(replicas, client, post):
+    assert post.title not in client.get('/').content.decode(), (
+        'Убедитесь, что лента читает посты из реплики.'
+    )
+    assert client.get(f'/posts/{post.id}/').status_code == 404
+
+    _replicate(post.author, post.category, post)
+    assert post.title in client.get('/').content.decode()
+    assert client.get(f'/posts/{post.id}/').status_code == 200
+
+
+def test_user_reads_own_writes(replicas, user_client, post):
+    _replicate(post.author, post.category, post)
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', {'text': 'Новый комментарий'}
+    )
+    assert response.status_code == 302
+    assert REPLICA_PIN_COOKIE in response.cookies, (
+        'Убедитесь, что после изменяющего запроса пользователь '
+        'читает данные из основной БД.'
+    )
+    response = user_client.get(f'/posts/{post.id}/')
+    assert 'Новый комментарий' in response.content.decode()
+
+    user_client.cookies.pop(REPLICA_PIN_COOKIE)
+    response = user_client.get(f'/posts/{post.id}/')
+    assert 'Новый комментарий' not in response.content.decode()
+
+
+def test_no_pin_cookie_without_replicas(user_client, post):
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', {'text': 'Комментарий'}
+    )
+    assert REPLICA_PIN_COOKIE not in response.cookies
+
+
+def test_pinned_client_reads_from_primary(replicas, post):
+    client = Client()
+    client.cookies[REPLICA_PIN_COOKIE] = '1'
+    assert client.get(f'/posts/{post.id}/').status_code == 200
+
+
+def _replicate_without_signals(*objects):
+    for obj in objects:
+        type(obj).objects.using('replica').bulk_create([obj])
+
+
+@pytest.mark.parametrize('pin_seconds, cached', ((10, False), (0, True)))
+def test_page_cache_and_lagging_replica(
+        settings, replicas, client, post, pin_seconds, cached
+):
+    settings.REPLICA_PIN_SECONDS = pin_seconds
+    assert post.title not in client.get('/').content.decode()
+
+    _replicate_without_signals(post.author, post.category, post)
+    assert (post.title not in client.get('/').content.decode()) == cached, (
+        'Убедитесь, что страница, прочитанная из реплики сразу после '
+        'изменения, не попадает в кэш страниц.'
+    )
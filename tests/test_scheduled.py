@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.signals import post_went_live
+
+
+@pytest.mark.django_db
+def test_scheduled_post_goes_live(
+        mixer, client, user, published_category, PostModel
+):
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert not post.is_live
+    assert post.title not in client.get('/').content.decode('utf-8')
+
+    PostModel.objects.filter(id=post.id).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    received = []
+
+    def receiver(post_ids, **kwargs):
+        received.extend(post_ids)
+
+    post_went_live.connect(receiver)
+    try:
+        call_command('publish_scheduled')
+    finally:
+        post_went_live.disconnect(receiver)
+
+    assert received == [post.id], (
+        'Убедитесь, что при выводе поста в ленту отправляется сигнал '
+        '`post_went_live`.'
+    )
+    post.refresh_from_db()
+    assert post.is_live
+    assert post.title in client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что отложенный пост появляется в ленте после запуска '
+        'планировщика, даже если лента уже была закэширована.'
+    )
+
+
+@pytest.mark.django_db
+def test_loaddata_fixture_is_live(client):
+    call_command('loaddata', settings.BASE_DIR.parent / 'db.json',
+                 verbosity=0)
+    assert Post.objects.filter(is_live=True).exists(), (
+        'Убедитесь, что посты из фикстуры с прошедшей датой публикации '
+        'попадают в ленту.'
+    )
+    assert client.get('/').context['page_obj'].object_list, (
+        'Убедитесь, что после loaddata лента не пуста.'
+    )
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.search import FTS5Backend, PythonBackend, get_search_backend
+from blog.utils import search_posts
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture(params=('fts5', 'python'))
+def backend(request, settings):
+    settings.SEARCH_BACKEND = request.param
+    return request.param
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make_post(title, text='Текст', **kwargs):
+        fields = {
+            'pub_date': timezone.now() - timedelta(days=1),
+            'is_published': True,
+            'author': user,
+            'category': published_category,
+            'location': None,
+            **kwargs,
+        }
+        return mixer.blend('blog.Post', title=title, text=text, **fields)
+    return make_post
+
+
+def test_auto_backend_uses_fts5(db):
+    assert isinstance(get_search_backend(), FTS5Backend), (
+        'Убедитесь, что при наличии FTS5 поиск использует его.'
+    )
+
+
+@pytest.mark.django_db
+def test_search_is_ranked_and_incremental(backend, make_post):
+    in_text = make_post('Заметки', 'Сегодня ходили в горы и на озеро.')
+    in_title = make_post('Горы Кавказа', 'Поездка на выходные.')
+    make_post('Море', 'Ничего общего.')
+
+    assert search_posts('горы') == [in_title.id, in_text.id], (
+        'Убедитесь, что совпадения в заголовке выше совпадений в тексте.'
+    )
+    assert search_posts('гор озеро') == [in_text.id]
+    assert search_posts('ГОРЫ"; DROP') == []
+
+    in_text.text = 'Сегодня сидели дома.'
+    in_text.save()
+    assert search_posts('горы') == [in_title.id], (
+        'Убедитесь, что индекс обновляется при сохранении поста.'
+    )
+    in_title.delete()
+    assert search_posts('горы') == []
+
+
+@pytest.mark.django_db
+def test_search_respects_visibility(
+        backend, make_post, mixer, published_category
+):
+    visible = make_post('Видимый пост')
+    make_post('Скрытый пост', is_published=False)
+    make_post('Будущий пост', pub_date=timezone.now() + timedelta(days=1))
+    hidden_category = mixer.blend('blog.Category', is_published=False)
+    make_post('Пост в скрытой категории', category=hidden_category)
+
+    assert search_posts('пост') == [visible.id], (
+        'Убедитесь, что поиск показывает только опубликованные посты.'
+    )
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index(backend, make_post):
+    post = make_post('Уникальный заголовок')
+    backend_class = FTS5Backend if backend == 'fts5' else PythonBackend
+    backend_class().remove_post(post.id)
+    assert search_posts('уникальный') == []
+    call_command('rebuild_search_index')
+    assert search_posts('уникальный') == [post.id]
+
+
+@pytest.mark.django_db
+def test_search_page(client, make_post):
+    for number in range(N_PER_PAGE + 2):
+        make_post(f'Пост про котов {number}')
+    response = client.get('/search/', {'q': 'котов'})
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert 'Найдено публикаций: 12' in content
+    assert len(response.context['page_obj'].object_list) == N_PER_PAGE
+    assert '?q=%D0%BA%D0%BE%D1%82%D0%BE%D0%B2&amp;page=2' in content, (
+        'Убедитесь, что ссылки пагинации сохраняют поисковый запрос.'
+    )
+
+    response = client.get('/search/', {'q': 'котов', 'page': 2})
+    assert len(response.context['page_obj'].object_list) == 2
+
+    assert client.get('/search/').status_code == 200
+
+
+@pytest.mark.django_db
+def test_search_normalizes_words(backend, make_post):
+    post = make_post('Зелёная Ёлка')
+    assert search_posts('елка') == [post.id]
+    assert search_posts('ЗЕЛЁН') == [post.id]
+
+
+@pytest.mark.django_db
+def test_backends_match_diacritics_alike(backend, make_post):
+    post = make_post('Иод и hello', 'Текст')
+    assert search_posts('иод hello') == [post.id]
+    assert search_posts('йод') == [] and search_posts('héllo') == [], (
+        'Убедитесь, что оба поисковых индекса одинаково различают '
+        'буквы с диакритикой.'
+    )
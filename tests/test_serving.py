@@ -0,0 +1,144 @@
+import gzip
+import json
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+from django.core.management import call_command
+
+from core.serving import FileServingApplication, Mount, get_mounts
+
+CONTENT = b'0123456789' * 100
+
+
+def _django_app(environ, start_response):
+    start_response('404 Not Found', [])
+    return [b'django']
+
+
+@pytest.fixture
+def files(tmp_path):
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'css' / 'style.css').write_bytes(CONTENT)
+    (tmp_path / 'css' / 'style.css.gz').write_bytes(gzip.compress(CONTENT))
+    (tmp_path / 'app.abc123.js').write_bytes(CONTENT)
+    return tmp_path
+
+
+@pytest.fixture
+def app(files):
+    return FileServingApplication(_django_app, [Mount(
+        prefix='/static/',
+        root=str(files),
+        max_age=60,
+        immutable_names=frozenset({'app.abc123.js'}),
+    )])
+
+
+def _request(app, path, method='GET', **headers):
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': method}
+    environ.update(
+        (f'HTTP_{name.upper()}', value) for name, value in headers.items()
+    )
+    setup_testing_defaults(environ)
+    response = {}
+
+    def start_response(status, response_headers):
+        response['status'] = int(status.split()[0])
+        response['headers'] = dict(response_headers)
+
+    response['body'] = b''.join(app(environ, start_response))
+    return response
+
+
+def test_file_is_served_with_cache_headers(app):
+    response = _request(app, '/static/css/style.css')
+    assert response['status'] == 200
+    assert response['body'] == CONTENT
+    headers = response['headers']
+    assert headers['Content-Type'] == 'text/css; charset=utf-8'
+    assert headers['Content-Length'] == str(len(CONTENT))
+    assert headers['Cache-Control'] == 'public, max-age=60'
+    assert 'ETag' in headers and 'Last-Modified' in headers
+    assert headers['X-Content-Type-Options'] == 'nosniff', (
+        'Убедитесь, что файлы отдаются с заголовком '
+        '`X-Content-Type-Options: nosniff`.'
+    )
+
+    response = _request(app, '/static/app.abc123.js')
+    assert 'immutable' in response['headers']['Cache-Control'], (
+        'Убедитесь, что файлы с хэшем в имени кэшируются навсегда.'
+    )
+
+
+@pytest.mark.parametrize('path', (
+    '/static/missing.css',
+    '/static/../conftest.py',
+    '/static/css/',
+    '/other/css/style.css',
+))
+def test_other_requests_are_passed_to_django(app, path):
+    assert _request(app, path)['body'] == b'django'
+
+
+def test_not_modified(app):
+    headers = _request(app, '/static/css/style.css')['headers']
+    response = _request(
+        app, '/static/css/style.css', if_none_match=headers['ETag']
+    )
+    assert response['status'] == 304
+    assert response['body'] == b''
+    response = _request(
+        app, '/static/css/style.css',
+        if_modified_since=headers['Last-Modified'],
+    )
+    assert response['status'] == 304
+
+
+@pytest.mark.parametrize('range_header, status, body', (
+    ('bytes=0-9', 206, CONTENT[:10]),
+    ('bytes=990-', 206, CONTENT[990:]),
+    ('bytes=-5', 206, CONTENT[-5:]),
+    ('bytes=5000-', 416, b''),
+    ('bytes=0-1,5-6', 200, CONTENT),
+))
+def test_range(app, range_header, status, body):
+    response = _request(app, '/static/css/style.css', range=range_header)
+    assert response['status'] == status
+    assert response['body'] == body
+
+
+def test_precompressed_file(app):
+    response = _request(
+        app, '/static/css/style.css', accept_encoding='br, gzip'
+    )
+    assert response['headers']['Content-Encoding'] == 'gzip'
+    assert response['headers']['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(response['body']) == CONTENT
+
+    response = _request(app, '/static/css/style.css')
+    assert 'Content-Encoding' not in response['headers']
+
+
+def test_head(app):
+    response = _request(app, '/static/css/style.css', method='HEAD')
+    assert response['status'] == 200
+    assert response['body'] == b''
+    assert response['headers']['Content-Length'] == str(len(CONTENT))
+
+
+def test_collectstatic_creates_manifest_and_compressed_files(
+        settings, tmp_path
+):
+    settings.STATIC_ROOT = tmp_path
+    call_command('collectstatic', interactive=False, verbosity=0)
+    manifest = json.loads((tmp_path / 'staticfiles.json').read_text())
+    hashed_name = manifest['paths']['css/bootstrap.min.css']
+    assert hashed_name != 'css/bootstrap.min.css', (
+        'Убедитесь, что collectstatic добавляет хэш в имена файлов.'
+    )
+    assert (tmp_path / f'{hashed_name}.gz').exists(), (
+        'Убедитесь, что collectstatic сохраняет сжатые копии файлов.'
+    )
+
+    mounts = {mount.prefix: mount for mount in get_mounts()}
+    assert hashed_name in mounts[settings.STATIC_URL].immutable_names
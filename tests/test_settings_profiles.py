@@ -0,0 +1,117 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+CHECK_SETTINGS = '''
+import json
+from django.conf import settings
+print(json.dumps({
+    'profile': settings.PROFILE,
+    'debug': settings.DEBUG,
+    'toolbar': 'debug_toolbar' in settings.INSTALLED_APPS,
+    'toolbar_middleware': any(
+        'debug_toolbar' in middleware for middleware in settings.MIDDLEWARE
+    ),
+    'conn_max_age': settings.DATABASES['default'].get('CONN_MAX_AGE', 0),
+    'loaders': settings.TEMPLATES[0]['OPTIONS'].get('loaders'),
+    'cache': settings.CACHES['default']['BACKEND'],
+    'middleware': settings.MIDDLEWARE,
+}))
+'''
+
+
+def _run(args, **env):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+            'BLOGICUM_PROFILE': 'dev',
+            **env,
+        },
+        capture_output=True,
+        text=True,
+    )
+
+
+def _load_settings(**env):
+    process = _run(['-c', CHECK_SETTINGS], **env)
+    assert process.returncode == 0, process.stderr
+    return json.loads(process.stdout)
+
+
+def test_dev_profile():
+    loaded = _load_settings()
+    assert loaded['profile'] == 'dev'
+    assert loaded['debug'] and loaded['toolbar']
+    assert loaded['toolbar_middleware']
+
+
+def test_prod_profile():
+    loaded = _load_settings(
+        BLOGICUM_PROFILE='prod', DJANGO_SECRET_KEY='secret'
+    )
+    assert not loaded['debug']
+    assert not loaded['toolbar'] and not loaded['toolbar_middleware'], (
+        'Убедитесь, что в профиле prod не подключён Django Debug Toolbar.'
+    )
+    assert loaded['conn_max_age'] > 0, (
+        'Убедитесь, что в профиле prod соединения с БД переиспользуются.'
+    )
+    assert loaded['loaders'][0][0] == (
+        'django.template.loaders.cached.Loader'
+    )
+    assert 'locmem' not in loaded['cache']
+    assert 'core.replicas.PrimaryPinMiddleware' not in loaded['middleware'], (
+        'Убедитесь, что в профиле prod без реплик не подключены '
+        'лишние middleware.'
+    )
+
+
+def test_prod_profile_requires_secret_key():
+    process = _run(
+        ['-c', CHECK_SETTINGS],
+        BLOGICUM_PROFILE='prod', DJANGO_SECRET_KEY='',
+    )
+    assert process.returncode
+    assert 'DJANGO_SECRET_KEY' in process.stderr
+
+
+def test_profiles_are_imported_without_settings():
+    process = _run(['-c', (
+        'import sys\n'
+        'import django\n'
+        'django.setup()\n'
+        'from core.management.commands import benchmark_requests\n'
+        "print('blogicum.settings.dev' in sys.modules)"
+    )], DJANGO_SETTINGS_MODULE='blogicum.settings.test')
+    assert process.returncode == 0, process.stderr
+    assert process.stdout.strip() == 'False', (
+        'Убедитесь, что список профилей импортируется без загрузки '
+        'настроек профиля dev.'
+    )
+
+
+def test_unknown_profile():
+    process = _run(['-c', CHECK_SETTINGS], BLOGICUM_PROFILE='stage')
+    assert process.returncode
+    assert 'BLOGICUM_PROFILE' in process.stderr
+
+
+def test_benchmark_compares_profiles():
+    process = _run([
+        'manage.py', 'benchmark_requests', '--json',
+        '--profiles', 'test', 'prod',
+        '--requests', '2', '--warmup', '0', '--posts', '3',
+    ])
+    assert process.returncode == 0, process.stderr
+    results = json.loads(process.stdout)
+    assert set(results) == {'test', 'prod'}
+    assert results['test'].keys() == results['prod'].keys()
+    assert all(
+        result['p50'] > 0 for result in results['prod'].values()
+    )
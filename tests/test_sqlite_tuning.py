@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from core.db import DEFAULT_SQLITE_PRAGMAS
+
+
+def _open(tmp_path):
+    wrapper = DatabaseWrapper({
+        **connection.settings_dict,
+        'NAME': str(tmp_path / 'db.sqlite3'),
+    })
+    wrapper.ensure_connection()
+    return wrapper
+
+
+def _pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_pragmas_are_applied_on_connection(settings, tmp_path):
+    settings.SQLITE_TUNING = True
+    settings.SQLITE_PRAGMAS = {'busy_timeout': 1234}
+    wrapper = _open(tmp_path)
+    try:
+        assert _pragma(wrapper, 'journal_mode') == 'wal', (
+            'Убедитесь, что при SQLITE_TUNING = True включается режим WAL.'
+        )
+        assert _pragma(wrapper, 'synchronous') == 1
+        assert _pragma(wrapper, 'cache_size') == (
+            DEFAULT_SQLITE_PRAGMAS['cache_size']
+        )
+        assert _pragma(wrapper, 'busy_timeout') == 1234, (
+            'Убедитесь, что SQLITE_PRAGMAS переопределяет значения '
+            'по умолчанию.'
+        )
+    finally:
+        wrapper.close()
+
+
+@pytest.mark.django_db
+def test_pragmas_are_not_applied_by_default(tmp_path):
+    wrapper = _open(tmp_path)
+    try:
+        assert _pragma(wrapper, 'journal_mode') == 'delete'
+    finally:
+        wrapper.close()
+
+
+def test_stress_comments_command():
+    process = subprocess.run(
+        [
+            sys.executable, 'manage.py', 'stress_comments',
+            '--writers', '3', '--comments', '3',
+        ],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+            'BLOGICUM_PROFILE': 'test',
+        },
+        capture_output=True,
+        text=True,
+    )
+    assert process.returncode == 0, process.stderr
+    lines = process.stdout.splitlines()
+    assert len(lines) == 3
+    for line in lines[1:]:
+        created, errors = line.split()[-2:]
+        assert (int(created), int(errors)) == (9, 0)
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.models import Job
+from core.tasks import (enqueue, get_queue_stats, get_retry_delay, task,
+                        work_off)
+
+calls = []
+
+
+@task
+def remember(value):
+    calls.append(value)
+
+
+@task(max_attempts=2)
+def always_fails():
+    raise RuntimeError('Ошибка задачи')
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+def test_job_is_run_once():
+    job = enqueue(remember, value=42)
+    assert work_off() == 1
+    assert work_off() == 0
+    job.refresh_from_db()
+    assert calls == [42]
+    assert job.status == Job.Status.DONE
+    assert job.attempts == 1
+
+
+@pytest.mark.django_db
+def test_failed_job_is_retried_with_backoff():
+    job = enqueue(always_fails)
+    work_off()
+    job.refresh_from_db()
+    assert job.status == Job.Status.PENDING
+    assert 'Ошибка задачи' in job.last_error
+    assert job.run_at >= timezone.now() + get_retry_delay(1) - timedelta(
+        seconds=1
+    ), 'Убедитесь, что повтор задачи откладывается.'
+    assert work_off() == 0
+
+    Job.objects.filter(id=job.id).update(run_at=timezone.now())
+    work_off()
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED, (
+        'Убедитесь, что после исчерпания попыток задача помечается '
+        'как упавшая.'
+    )
+
+
+def test_retry_delay_grows():
+    delays = [get_retry_delay(attempt) for attempt in range(1, 5)]
+    assert delays == sorted(delays)
+    assert delays[1] == delays[0] * 2
+
+
+@pytest.mark.django_db
+def test_queue_stats(capsys):
+    enqueue(remember, value=1)
+    enqueue(remember, value=2)
+    work_off(max_jobs=1)
+    stats = get_queue_stats()
+    assert stats[Job.Status.PENDING] == 1
+    assert stats[Job.Status.DONE] == 1
+    assert stats['due'] == 1
+    call_command('queue_stats')
+    assert 'В очереди: 1' in capsys.readouterr().out
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_workers_burst():
+    for value in range(5):
+        enqueue(remember, value=value)
+    call_command('run_workers', '--workers', '2', '--burst')
+    assert sorted(calls) == list(range(5))
+    assert Job.objects.filter(status=Job.Status.DONE).count() == 5
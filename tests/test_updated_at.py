@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models import F
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+
+OLD = timezone.now() - timedelta(days=30)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model, url', (
+    (Category, '/admin/blog/category/'),
+    (Location, '/admin/blog/location/'),
+    (Post, '/admin/blog/post/'),
+))
+def test_admin_list_editable_bumps_updated_at(
+        admin_client, post_with_published_location, model, url
+):
+    obj = model.objects.first()
+    model.objects.filter(id=obj.id).update(updated_at=OLD)
+    response = admin_client.post(url, data={
+        'form-TOTAL_FORMS': 1,
+        'form-INITIAL_FORMS': 1,
+        'form-0-id': obj.id,
+        'form-0-is_published': '',
+        '_save': 'Сохранить',
+    })
+    assert response.status_code == 302
+    obj.refresh_from_db()
+    assert not obj.is_published
+    assert obj.updated_at > OLD, (
+        'Убедитесь, что изменение is_published в списке объектов '
+        'админки обновляет поле updated_at.'
+    )
+
+
+@pytest.mark.django_db
+def test_comment_edit_bumps_updated_at(
+        mixer, user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    Comment.objects.filter(id=comment.id).update(updated_at=OLD)
+    user_client.post(
+        f'/posts/{post.id}/edit_comment/{comment.id}',
+        data={'text': 'Новый текст'},
+    )
+    comment.refresh_from_db()
+    assert comment.updated_at > OLD
+    assert comment.created_at < comment.updated_at
+
+
+@pytest.mark.django_db
+def test_publish_scheduled_bumps_updated_at(mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    Post.objects.filter(id=post.id).update(
+        pub_date=timezone.now() - timedelta(minutes=1), updated_at=OLD
+    )
+    call_command('publish_scheduled')
+    post.refresh_from_db()
+    assert post.is_live
+    assert post.updated_at > OLD, (
+        'Убедитесь, что вывод отложенного поста в ленту обновляет '
+        'поле updated_at.'
+    )
+
+
+@pytest.mark.django_db
+def test_loaddata_fixture():
+    call_command('loaddata', settings.BASE_DIR.parent / 'db.json',
+                 verbosity=0)
+    assert Post.objects.exists()
+    assert not Post.objects.exclude(updated_at=F('created_at')).exists()